@@ -0,0 +1,52 @@
+// Runtime Guard Code for SafeRL ProofStack
+// Generated from specification hash: 224e23bff5c7b2cfca2788caabb1705e22d5d0ceacc43462aaf914df5319cc0d
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <math.h>
+#include <stdbool.h>
+
+// State structure
+typedef struct {
+    double cart_position;
+    double cart_velocity;
+    double pole_angle;
+    double pole_angular_velocity;
+} State;
+
+// Action structure
+typedef struct {
+    double force;
+} Action;
+
+// Configurable constraints generated from specification metadata.
+#define MAX_POSITION 2.4
+#define MAX_ANGLE 0.2095
+#define MAX_FORCE 10.0
+
+// Safety predicate
+bool safe(State* state) {
+    return fabs(state->cart_position) <= MAX_POSITION &&
+           fabs(state->pole_angle) <= MAX_ANGLE;
+}
+
+// Guard predicate
+bool guard(State* state, Action* action) {
+    return fabs(state->cart_position) <= MAX_POSITION - 0.1 &&
+           fabs(state->pole_angle) <= MAX_ANGLE - 0.01 &&
+           fabs(action->force) <= MAX_FORCE;
+}
+
+// Runtime guard function
+bool runtime_guard(State* state, Action* action) {
+    if (!guard(state, action)) {
+        printf("Safety guard violation detected for spec hash 224e23bff5c7b2cfca2788caabb1705e22d5d0ceacc43462aaf914df5319cc0d!\n");
+        return false;
+    }
+    return true;
+}
+
+// Main guard interface
+extern "C" bool check_safety(State* state, Action* action) {
+    return runtime_guard(state, action);
+}
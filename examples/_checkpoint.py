@@ -0,0 +1,27 @@
+"""Reuse of trained agents across runs of the example scripts."""
+
+import json
+from pathlib import Path
+
+
+def _meta_path(checkpoint: Path) -> Path:
+    return checkpoint.with_suffix(".meta.json")
+
+
+def checkpoint_is_current(checkpoint: Path, script: str, **training) -> bool:
+    """True if ``checkpoint`` is newer than ``script`` and trained with ``training``.
+
+    ``training`` holds whatever determines the agent (algorithm, timestep
+    budget); it is compared with the sidecar written by :func:`record_training`.
+    """
+    try:
+        trained_with = json.loads(_meta_path(checkpoint).read_text(encoding="utf-8"))
+        checkpoint_mtime = checkpoint.stat().st_mtime
+    except (FileNotFoundError, ValueError):
+        return False
+    return trained_with == training and checkpoint_mtime > Path(script).stat().st_mtime
+
+
+def record_training(checkpoint: Path, **training) -> None:
+    """Write the sidecar that :func:`checkpoint_is_current` checks."""
+    _meta_path(checkpoint).write_text(json.dumps(training), encoding="utf-8")
@@ -0,0 +1,82 @@
+"""Batched evaluation rollouts shared by the example scripts."""
+
+import gymnasium as gym
+import numpy as np
+import torch
+
+
+def deterministic_policy(model):
+    """Return a batched ``obs -> actions`` function that calls the policy network directly.
+
+    Skips ``model.predict``'s per-call observation checks and reshaping; the
+    rollout already hands over a well-formed ``(n_envs, obs_dim)`` batch.
+    """
+    policy = model.policy
+    policy.set_training_mode(False)
+
+    def act(obs):
+        with torch.no_grad():
+            obs_tensor = torch.as_tensor(obs, dtype=torch.float32, device=policy.device)
+            actions = policy._predict(obs_tensor, deterministic=True).cpu().numpy()
+        # Map actions back into the action space exactly as model.predict does
+        if isinstance(model.action_space, gym.spaces.Box):
+            if policy.squash_output:
+                actions = policy.unscale_action(actions)
+            else:
+                actions = np.clip(
+                    actions, model.action_space.low, model.action_space.high
+                )
+        return actions
+
+    return act
+
+
+def rollout(model, env_fn, n_episodes, max_steps, n_envs=8):
+    """Run ``n_episodes`` deterministic episodes and log every step.
+
+    Runs ``n_envs`` copies of the environment in lockstep so each step is a
+    single batched policy call. Observations and actions are logged to
+    preallocated buffers, so callers can count violations in one vectorized
+    pass.
+
+    Returns:
+        ``(observations, actions)`` arrays with one row per step taken
+    """
+    n_envs = min(n_envs, n_episodes)
+    envs = gym.vector.SyncVectorEnv([env_fn] * n_envs)
+    capacity = n_episodes * max_steps
+    obs_log = np.empty(
+        (capacity, *model.observation_space.shape), dtype=np.float32
+    )
+    action_log = np.empty(
+        (capacity, *model.action_space.shape), dtype=model.action_space.dtype
+    )
+    logged = 0
+    # An env stays active while it is running one of the n_episodes episodes
+    active = np.ones(n_envs, dtype=bool)
+    started = n_envs
+
+    act = deterministic_policy(model)
+    obs, info = envs.reset()
+    while active.any():
+        actions = act(obs)
+        obs, reward, terminated, truncated, info = envs.step(actions)
+        done = terminated | truncated
+
+        # Finished envs auto-reset; check their terminal observation instead
+        step_obs = obs.copy()
+        if done.any():
+            step_obs[done] = np.stack(info["final_observation"][done])
+        n = int(active.sum())
+        obs_log[logged : logged + n] = step_obs[active]
+        action_log[logged : logged + n] = actions[active]
+        logged += n
+
+        for i in np.flatnonzero(done & active):
+            if started < n_episodes:
+                started += 1
+            else:
+                active[i] = False
+
+    envs.close()
+    return obs_log[:logged], action_log[:logged]
@@ -10,7 +10,11 @@ import gymnasium as gym
 import numpy as np
 from stable_baselines3 import PPO
 from proofstack import ProofPipeline, SpecGen
+from _checkpoint import checkpoint_is_current, record_training
+from _rollout import rollout
 import os
+import sys
+from pathlib import Path
 
 
 def main():
@@ -53,13 +57,22 @@ def main():
     print(f"  Lemmas: {spec.lemmas}")
 
     # 3. Train Safe RL Agent
-    print("\n3. Training PPO agent...")
-    model = PPO("MlpPolicy", env, verbose=0)
-    model.learn(total_timesteps=5000)
+    # Reuse a checkpoint trained the same way (and newer than this script)
+    model_path = Path("cartpole_ppo.zip")
+    training = {"algorithm": "ppo", "total_timesteps": 5000}
+    if checkpoint_is_current(model_path, __file__, **training):
+        print("\n3. Loading cached PPO agent...")
+        model = PPO.load(model_path, env=env)
+        print("  Model loaded from cartpole_ppo.zip")
+    else:
+        print("\n3. Training PPO agent...")
+        model = PPO("MlpPolicy", env, verbose=0)
+        model.learn(total_timesteps=training["total_timesteps"])
 
-    # Save the model
-    model.save("cartpole_ppo.zip")
-    print("  Model saved as cartpole_ppo.zip")
+        # Save the model
+        model.save(model_path)
+        record_training(model_path, **training)
+        print("  Model saved as cartpole_ppo.zip")
 
     # 4. Test Safety Violations
     print("\n4. Testing safety violations...")
@@ -83,17 +96,20 @@ def main():
 
     print(f"  Compliance bundle created at: {bundle.path}")
     print("  Generated artifacts:")
-    for artifact in bundle.path.glob("*"):
-        if artifact.is_file():
-            print(f"    - {artifact.name}")
+    # Collect the listing and emit it with a single write.
+    # scandir's DirEntry carries the file type, so no stat per artifact
+    with os.scandir(bundle.path) as entries:
+        lines = [f"    - {entry.name}\n" for entry in entries if entry.is_file()]
+    sys.stdout.write("".join(lines))
 
     # 6. Show generated Lean proof
     print("\n6. Generated Lean4 Proof:")
     print("-" * 30)
     lean_file = spec.lean_file_path
     if lean_file and lean_file.exists():
+        # Only the preview is shown, so never read more than it needs
         with open(lean_file, "r") as f:
-            content = f.read()
+            content = f.read(501)
             print(content[:500] + "..." if len(content) > 500 else content)
     else:
         print("  Lean proof file not found.")
@@ -101,7 +117,7 @@ def main():
     # 7. Show generated guard code
     print("\n7. Generated Runtime Guard Code:")
     print("-" * 30)
-    guard_file = bundle.path / "guard.c"
+    guard_file = Path(bundle.path) / "guard.c"
     if guard_file.exists():
         with open(guard_file, "r") as f:
             content = f.read()
@@ -123,27 +139,24 @@ def main():
     print("3. Add real-time monitoring")
 
 
-def test_safety_violations(model, env, n_episodes=100):
+def test_safety_violations(model, env, n_episodes=100, n_envs=8):
     """Test for safety violations during agent execution."""
-    violations = {"position_violations": 0, "angle_violations": 0, "total_steps": 0}
-
-    for episode in range(n_episodes):
-        obs, info = env.reset()
-        done = False
-
-        while not done:
-            action, _ = model.predict(obs, deterministic=True)
-            obs, reward, done, truncated, info = env.step(action)
-
-            violations["total_steps"] += 1
-
-            # Check safety violations
-            if abs(obs[0]) > 2.4:  # Cart position
-                violations["position_violations"] += 1
-            if abs(obs[2]) > 0.2095:  # Pole angle
-                violations["angle_violations"] += 1
-
-    return violations
+    obs_log, _ = rollout(
+        model,
+        lambda: gym.make(env.spec.id),
+        n_episodes,
+        env.spec.max_episode_steps,
+        n_envs,
+    )
+    return {
+        "position_violations": int(
+            np.count_nonzero(np.abs(obs_log[:, 0]) > 2.4)  # Cart position
+        ),
+        "angle_violations": int(
+            np.count_nonzero(np.abs(obs_log[:, 2]) > 0.2095)  # Pole angle
+        ),
+        "total_steps": len(obs_log),
+    }
 
 
 if __name__ == "__main__":
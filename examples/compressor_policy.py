@@ -1,17 +1,30 @@
+from pathlib import Path
+
 import gymnasium as gym
 from proofstack.rl.algorithms import create_safe_algorithm
+from _checkpoint import checkpoint_is_current, record_training
+
 
+def train_compressor_policy(total_timesteps: int = 10_000, force: bool = False) -> str:
+    """Train a safety-constrained policy and return saved model path.
+
+    Training is skipped when a checkpoint newer than this script and trained
+    for the same ``total_timesteps`` already exists, unless ``force`` is set.
+    """
+    output_path = "ppo_cartpole_safe.zip"
+    checkpoint = Path(output_path)
+    training = {"algorithm": "ppo", "total_timesteps": total_timesteps}
+    if not force and checkpoint_is_current(checkpoint, __file__, **training):
+        return output_path
 
-def train_compressor_policy(total_timesteps: int = 10_000) -> str:
-    """Train a safety-constrained policy and return saved model path."""
     env = gym.make("CartPole-v1")
     safe_algo = create_safe_algorithm("ppo", env)
     safe_algo.train(total_timesteps=total_timesteps)
-    output_path = "ppo_cartpole_safe.zip"
     safe_algo.save(output_path)
+    record_training(checkpoint, **training)
     return output_path
 
 
 if __name__ == "__main__":
     artifact = train_compressor_policy()
-    print(f"Trained safe PPO agent saved as '{artifact}'")
+    print(f"Safe PPO agent available at '{artifact}'")
@@ -10,8 +10,25 @@ temperature, and flow rates.
 import gymnasium as gym
 import numpy as np
 from stable_baselines3 import SAC
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import SubprocVecEnv
 from proofstack import ProofPipeline, SpecGen
+from _checkpoint import checkpoint_is_current, record_training
+from _rollout import rollout
 import os
+import sys
+from pathlib import Path
+
+
+_SAFE_INITIAL_STATE = np.array(
+    [
+        50.0,  # pressure (psi)
+        75.0,  # temperature (°C)
+        20.0,  # flow rate (m³/h)
+        0.5,  # valve position
+    ],
+    dtype=np.float32,
+)
 
 
 class CompressorStationEnv(gym.Env):
@@ -37,23 +54,17 @@ class CompressorStationEnv(gym.Env):
         self.max_temperature = 150.0  # °C
         self.max_flow_rate = 40.0  # m³/h
 
-        self.state = None
+        self.state = _SAFE_INITIAL_STATE.copy()
         self.step_count = 0
         self.max_steps = 1000
 
     def reset(self, seed=None):
         super().reset(seed=seed)
 
-        # Initialize to safe state
-        self.state = np.array(
-            [
-                50.0,  # pressure (psi)
-                75.0,  # temperature (°C)
-                20.0,  # flow rate (m³/h)
-                0.5,  # valve position
-            ],
-            dtype=np.float32,
-        )
+        # Initialize to safe state. A fresh array per episode: under vector-env
+        # autoreset the previous episode's terminal observation still
+        # references the old one, so it must not be overwritten in place.
+        self.state = _SAFE_INITIAL_STATE.copy()
 
         self.step_count = 0
         return self.state, {}
@@ -61,52 +72,65 @@ class CompressorStationEnv(gym.Env):
     def step(self, action):
         self.step_count += 1
 
-        # Apply actions
-        valve_delta = action[0] * 0.1
-        compressor_delta = action[1] * 0.1
-
-        # Update state (simplified dynamics)
-        self.state[3] = np.clip(self.state[3] + valve_delta, 0.0, 1.0)  # valve
-        self.state[0] += compressor_delta * 2.0  # pressure
-        self.state[1] += compressor_delta * 1.5  # temperature
-        self.state[2] = self.state[3] * 40.0  # flow rate
-
-        # Apply safety constraints
-        self.state[0] = np.clip(self.state[0], 0.0, self.max_pressure)
-        self.state[1] = np.clip(self.state[1], 0.0, self.max_temperature)
-        self.state[2] = np.clip(self.state[2], 0.0, self.max_flow_rate)
-
-        # Calculate reward
-        reward = self._calculate_reward()
+        pressure, temperature, flow_rate, valve, reward, violated = _step_kernel(
+            self.state.tolist(),
+            float(action[0]),
+            float(action[1]),
+            self.max_pressure,
+            self.max_temperature,
+            self.max_flow_rate,
+        )
+        self.state[:] = (pressure, temperature, flow_rate, valve)
 
         # Check if episode is done
         done = self.step_count >= self.max_steps
 
         # Check for safety violations
-        if self._check_safety_violation():
+        if violated:
             reward -= 100.0  # Penalty for safety violation
             done = True
 
         return self.state, reward, done, False, {}
 
-    def _calculate_reward(self):
-        """Calculate reward based on efficiency and safety."""
-        # Efficiency reward (higher flow rate is better)
-        efficiency_reward = self.state[2] / self.max_flow_rate
-
-        # Safety penalty (closer to limits is worse)
-        pressure_penalty = max(0, (self.state[0] - 60.0) / 20.0)
-        temperature_penalty = max(0, (self.state[1] - 100.0) / 50.0)
 
-        return efficiency_reward - pressure_penalty - temperature_penalty
-
-    def _check_safety_violation(self):
-        """Check if safety bounds are violated."""
-        return (
-            self.state[0] > self.max_pressure
-            or self.state[1] > self.max_temperature
-            or self.state[2] > self.max_flow_rate
-        )
+def _step_kernel(
+    state, valve_action, compressor_action, max_pressure, max_temperature, max_flow_rate
+):
+    """Compressor dynamics, reward and safety check on plain Python floats.
+
+    Kept free of NumPy calls: for a four-element state, ufunc dispatch costs far
+    more than the arithmetic itself.
+    """
+    pressure, temperature, _, valve = state
+
+    # Apply actions
+    valve_delta = valve_action * 0.1
+    compressor_delta = compressor_action * 0.1
+
+    # Update state (simplified dynamics)
+    valve = min(max(valve + valve_delta, 0.0), 1.0)
+    pressure += compressor_delta * 2.0
+    temperature += compressor_delta * 1.5
+    flow_rate = valve * 40.0
+
+    # Apply safety constraints
+    pressure = min(max(pressure, 0.0), max_pressure)
+    temperature = min(max(temperature, 0.0), max_temperature)
+    flow_rate = min(max(flow_rate, 0.0), max_flow_rate)
+
+    # Reward: efficiency (higher flow rate is better) minus closeness to limits
+    efficiency_reward = flow_rate / max_flow_rate
+    # Penalties are zero below their thresholds; a compare skips the math there
+    pressure_penalty = (pressure - 60.0) / 20.0 if pressure > 60.0 else 0.0
+    temperature_penalty = (temperature - 100.0) / 50.0 if temperature > 100.0 else 0.0
+    reward = efficiency_reward - pressure_penalty - temperature_penalty
+
+    violated = (
+        pressure > max_pressure
+        or temperature > max_temperature
+        or flow_rate > max_flow_rate
+    )
+    return pressure, temperature, flow_rate, valve, reward, violated
 
 
 def main():
@@ -159,13 +183,27 @@ def main():
     print(f"  Lemmas: {spec.lemmas}")
 
     # 3. Train Safe RL Agent
-    print("\n3. Training SAC agent...")
-    model = SAC("MlpPolicy", env, verbose=0, learning_rate=0.001)
-    model.learn(total_timesteps=10000)
+    # Reuse a checkpoint trained the same way (and newer than this script)
+    model_path = Path("compressor_sac.zip")
+    training = {"algorithm": "sac", "total_timesteps": 10000}
+    if checkpoint_is_current(model_path, __file__, **training):
+        print("\n3. Loading cached SAC agent...")
+        model = SAC.load(model_path, env=env)
+        print("  Model loaded from compressor_sac.zip")
+    else:
+        print("\n3. Training SAC agent...")
+        # Collect experience from worker processes so env stepping overlaps
+        train_env = make_vec_env(
+            CompressorStationEnv, n_envs=8, vec_env_cls=SubprocVecEnv
+        )
+        model = SAC("MlpPolicy", train_env, verbose=0, learning_rate=0.001)
+        model.learn(total_timesteps=training["total_timesteps"])
+        train_env.close()
 
-    # Save the model
-    model.save("compressor_sac.zip")
-    print("  Model saved as compressor_sac.zip")
+        # Save the model
+        model.save(model_path)
+        record_training(model_path, **training)
+        print("  Model saved as compressor_sac.zip")
 
     # 4. Test Safety Violations
     print("\n4. Testing safety violations...")
@@ -192,17 +230,20 @@ def main():
 
     print(f"  Compliance bundle created at: {bundle.path}")
     print("  Generated artifacts:")
-    for artifact in bundle.path.glob("*"):
-        if artifact.is_file():
-            print(f"    - {artifact.name}")
+    # Collect the listing and emit it with a single write.
+    # scandir's DirEntry carries the file type, so no stat per artifact
+    with os.scandir(bundle.path) as entries:
+        lines = [f"    - {entry.name}\n" for entry in entries if entry.is_file()]
+    sys.stdout.write("".join(lines))
 
     # 6. Show generated Lean proof
     print("\n6. Generated Lean4 Proof:")
     print("-" * 30)
     lean_file = spec.lean_file_path
     if lean_file and lean_file.exists():
+        # Only the preview is shown, so never read more than it needs
         with open(lean_file, "r") as f:
-            content = f.read()
+            content = f.read(501)
             print(content[:500] + "..." if len(content) > 500 else content)
     else:
         print("  Lean proof file not found.")
@@ -210,7 +251,7 @@ def main():
     # 7. Show generated guard code
     print("\n7. Generated Runtime Guard Code:")
     print("-" * 30)
-    guard_file = bundle.path / "guard.c"
+    guard_file = Path(bundle.path) / "guard.c"
     if guard_file.exists():
         with open(guard_file, "r") as f:
             content = f.read()
@@ -234,35 +275,20 @@ def main():
     print("4. Extend to multi-compressor networks")
 
 
-def test_compressor_safety(model, env, n_episodes=100):
+def test_compressor_safety(model, env, n_episodes=100, n_envs=8):
     """Test for safety violations during agent execution."""
-    violations = {
-        "pressure_violations": 0,
-        "temperature_violations": 0,
-        "flow_violations": 0,
-        "total_steps": 0,
+    obs_log, _ = rollout(
+        model, CompressorStationEnv, n_episodes, env.max_steps, n_envs
+    )
+    return {
+        "pressure_violations": int(np.count_nonzero(obs_log[:, 0] > env.max_pressure)),
+        "temperature_violations": int(
+            np.count_nonzero(obs_log[:, 1] > env.max_temperature)
+        ),
+        "flow_violations": int(np.count_nonzero(obs_log[:, 2] > env.max_flow_rate)),
+        "total_steps": len(obs_log),
     }
 
-    for episode in range(n_episodes):
-        obs, info = env.reset()
-        done = False
-
-        while not done:
-            action, _ = model.predict(obs, deterministic=True)
-            obs, reward, done, truncated, info = env.step(action)
-
-            violations["total_steps"] += 1
-
-            # Check safety violations
-            if obs[0] > env.max_pressure:  # Pressure
-                violations["pressure_violations"] += 1
-            if obs[1] > env.max_temperature:  # Temperature
-                violations["temperature_violations"] += 1
-            if obs[2] > env.max_flow_rate:  # Flow rate
-                violations["flow_violations"] += 1
-
-    return violations
-
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,4 @@
 # Example: Generate proof bundle using ProofPipeline
-import os
-import sys
-
-sys.path.append(".")
-
 from proofstack import ProofPipeline
 
 
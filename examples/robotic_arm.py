@@ -7,11 +7,16 @@ safety constraints on joint torques, end-effector position, and quaternion
 orientation.
 """
 
+import math
+
 import gymnasium as gym
 import numpy as np
 from stable_baselines3 import DDPG
 from proofstack import ProofPipeline, SpecGen
+from _rollout import rollout
 import os
+import sys
+from pathlib import Path
 
 
 class RoboticArmEnv(gym.Env):
@@ -21,17 +26,17 @@ class RoboticArmEnv(gym.Env):
         super().__init__()
 
         # State space: [joint_angles(3), joint_velocities(3), end_effector_pos(3), quaternion(4)]
-        self.observation_space = gym.spaces.Box(
-            low=np.array([-np.pi] * 3 + [-2.0] * 3 + [-1.0] * 3 + [-1.0] * 4),
-            high=np.array([np.pi] * 3 + [2.0] * 3 + [1.0] * 3 + [1.0] * 4),
-            dtype=np.float32,
-        )
+        # Bounds are symmetric and built directly in float32, so Box does not
+        # have to down-cast (and warn about) float64 arrays.
+        high = np.empty(13, dtype=np.float32)
+        high[0:3] = np.pi
+        high[3:6] = 2.0
+        high[6:13] = 1.0
+        self.observation_space = gym.spaces.Box(low=-high, high=high, dtype=np.float32)
 
         # Action space: [joint_torques(3)]
         self.action_space = gym.spaces.Box(
-            low=np.array([-10.0, -10.0, -10.0]),
-            high=np.array([10.0, 10.0, 10.0]),
-            dtype=np.float32,
+            low=-10.0, high=10.0, shape=(3,), dtype=np.float32
         )
 
         # Safety bounds
@@ -73,30 +78,12 @@ class RoboticArmEnv(gym.Env):
     def step(self, action):
         self.step_count += 1
 
-        # Apply torques (simplified dynamics)
-        dt = 0.01
-        inertia = np.array([1.0, 1.0, 1.0])  # Simplified inertia
-
-        # Update joint velocities
-        self.state[3:6] += action / inertia * dt
-
-        # Update joint angles
-        self.state[0:3] += self.state[3:6] * dt
-
-        # Update end effector position (simplified forward kinematics)
-        self.state[6:9] = self._forward_kinematics(self.state[0:3])
-
-        # Update quaternion (simplified)
-        self.state[9:13] = self._update_quaternion(
-            self.state[9:13], self.state[3:6], dt
-        )
-
-        # Apply safety constraints
-        self.state[3:6] = np.clip(
-            self.state[3:6], -self.max_joint_velocity, self.max_joint_velocity
-        )
-        self.state[6:9] = np.clip(
-            self.state[6:9], -self.workspace_bounds, self.workspace_bounds
+        self.state[:] = _step_kernel(
+            self.state.tolist(),
+            action.tolist(),
+            0.01,
+            self.max_joint_velocity,
+            self.workspace_bounds,
         )
 
         # Calculate reward
@@ -112,51 +99,18 @@ class RoboticArmEnv(gym.Env):
 
         return self.state, reward, done, False, {}
 
-    def _forward_kinematics(self, joint_angles):
-        """Simplified forward kinematics."""
-        # Simple 3-DOF arm model
-        x = 0.3 * np.cos(joint_angles[0]) + 0.3 * np.cos(
-            joint_angles[0] + joint_angles[1]
-        )
-        y = 0.3 * np.sin(joint_angles[0]) + 0.3 * np.sin(
-            joint_angles[0] + joint_angles[1]
-        )
-        z = 0.5 + 0.3 * np.sin(joint_angles[2])
-        return np.array([x, y, z])
-
-    def _update_quaternion(self, quat, angular_vel, dt):
-        """Update quaternion based on angular velocity."""
-        # Simplified quaternion update
-        omega = np.array([0.0, angular_vel[0], angular_vel[1], angular_vel[2]])
-        quat_dot = 0.5 * self._quaternion_multiply(omega, quat)
-        new_quat = quat + quat_dot * dt
-        return new_quat / np.linalg.norm(new_quat)  # Normalize
-
-    def _quaternion_multiply(self, q1, q2):
-        """Multiply two quaternions."""
-        w1, x1, y1, z1 = q1
-        w2, x2, y2, z2 = q2
-        return np.array(
-            [
-                w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
-                w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
-                w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
-                w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
-            ]
-        )
-
     def _calculate_reward(self):
         """Calculate reward based on task completion and safety."""
-        # Task reward (reach target position)
-        target_pos = np.array([0.5, 0.0, 0.3])
-        distance = np.linalg.norm(self.state[6:9] - target_pos)
+        _, _, _, v0, v1, v2, px, py, pz, _, _, _, _ = self.state.tolist()
+
+        # Task reward (reach target position (0.5, 0.0, 0.3))
+        dx, dy, dz = px - 0.5, py, pz - 0.3
+        distance = math.sqrt(dx * dx + dy * dy + dz * dz)
         task_reward = 1.0 / (1.0 + distance)
 
         # Safety penalty (closer to limits is worse)
-        torque_penalty = np.sum(np.abs(self.state[3:6])) / (3 * self.max_joint_velocity)
-        workspace_penalty = np.sum(np.abs(self.state[6:9])) / (
-            3 * self.workspace_bounds
-        )
+        torque_penalty = (abs(v0) + abs(v1) + abs(v2)) / (3 * self.max_joint_velocity)
+        workspace_penalty = (abs(px) + abs(py) + abs(pz)) / (3 * self.workspace_bounds)
 
         return task_reward - 0.1 * torque_penalty - 0.1 * workspace_penalty
 
@@ -177,6 +131,62 @@ class RoboticArmEnv(gym.Env):
         return False
 
 
+def _step_kernel(state, action, dt, max_joint_velocity, workspace_bounds):
+    """Arm dynamics for one step on plain Python floats; returns the new state.
+
+    Kept free of NumPy calls: for a 13-element state, ufunc dispatch costs far
+    more than the arithmetic itself.
+    """
+    a0, a1, a2, v0, v1, v2, _, _, _, w, x, y, z = state
+    inertia = 1.0  # Simplified inertia
+
+    # Update joint velocities
+    v0 += action[0] / inertia * dt
+    v1 += action[1] / inertia * dt
+    v2 += action[2] / inertia * dt
+
+    # Update joint angles
+    a0 += v0 * dt
+    a1 += v1 * dt
+    a2 += v2 * dt
+
+    # Update end effector position (simplified 3-DOF forward kinematics)
+    px = 0.3 * math.cos(a0) + 0.3 * math.cos(a0 + a1)
+    py = 0.3 * math.sin(a0) + 0.3 * math.sin(a0 + a1)
+    pz = 0.5 + 0.3 * math.sin(a2)
+
+    # Update quaternion (simplified) and renormalize. The derivative is the
+    # product (0, v) * q; with a zero scalar part the w1 terms drop out.
+    dw = -v0 * x - v1 * y - v2 * z
+    dx = v0 * w + v1 * z - v2 * y
+    dy = -v0 * z + v1 * w + v2 * x
+    dz = v0 * y - v1 * x + v2 * w
+    half_dt = 0.5 * dt
+    w += dw * half_dt
+    x += dx * half_dt
+    y += dy * half_dt
+    z += dz * half_dt
+    norm = math.sqrt(w * w + x * x + y * y + z * z)
+
+    # Apply safety constraints
+    vmax, bound = max_joint_velocity, workspace_bounds
+    return (
+        a0,
+        a1,
+        a2,
+        min(max(v0, -vmax), vmax),
+        min(max(v1, -vmax), vmax),
+        min(max(v2, -vmax), vmax),
+        min(max(px, -bound), bound),
+        min(max(py, -bound), bound),
+        min(max(pz, -bound), bound),
+        w / norm,
+        x / norm,
+        y / norm,
+        z / norm,
+    )
+
+
 def main():
     print("🤖 Robotic Arm Safety with SafeRL ProofStack")
     print("=" * 60)
@@ -262,17 +272,20 @@ def main():
 
     print(f"  Compliance bundle created at: {bundle.path}")
     print("  Generated artifacts:")
-    for artifact in bundle.path.glob("*"):
-        if artifact.is_file():
-            print(f"    - {artifact.name}")
+    # Collect the listing and emit it with a single write.
+    # scandir's DirEntry carries the file type, so no stat per artifact
+    with os.scandir(bundle.path) as entries:
+        lines = [f"    - {entry.name}\n" for entry in entries if entry.is_file()]
+    sys.stdout.write("".join(lines))
 
     # 6. Show generated Lean proof
     print("\n6. Generated Lean4 Proof:")
     print("-" * 30)
     lean_file = spec.lean_file_path
     if lean_file and lean_file.exists():
+        # Only the preview is shown, so never read more than it needs
         with open(lean_file, "r") as f:
-            content = f.read()
+            content = f.read(501)
             print(content[:500] + "..." if len(content) > 500 else content)
     else:
         print("  Lean proof file not found.")
@@ -280,7 +293,7 @@ def main():
     # 7. Show generated guard code
     print("\n7. Generated Runtime Guard Code:")
     print("-" * 30)
-    guard_file = bundle.path / "guard.c"
+    guard_file = Path(bundle.path) / "guard.c"
     if guard_file.exists():
         with open(guard_file, "r") as f:
             content = f.read()
@@ -304,35 +317,24 @@ def main():
     print("4. Extend to multi-arm coordination")
 
 
-def test_robotic_arm_safety(model, env, n_episodes=100):
+def test_robotic_arm_safety(model, env, n_episodes=100, n_envs=8):
     """Test for safety violations during agent execution."""
-    violations = {
-        "torque_violations": 0,
-        "velocity_violations": 0,
-        "workspace_violations": 0,
-        "total_steps": 0,
+    obs_log, action_log = rollout(
+        model, RoboticArmEnv, n_episodes, env.max_steps, n_envs
+    )
+    return {
+        "torque_violations": int(
+            (np.abs(action_log) > env.max_torque).any(axis=1).sum()
+        ),
+        "velocity_violations": int(
+            (np.abs(obs_log[:, 3:6]) > env.max_joint_velocity).any(axis=1).sum()
+        ),
+        "workspace_violations": int(
+            (np.abs(obs_log[:, 6:9]) > env.workspace_bounds).any(axis=1).sum()
+        ),
+        "total_steps": len(obs_log),
     }
 
-    for episode in range(n_episodes):
-        obs, info = env.reset()
-        done = False
-
-        while not done:
-            action, _ = model.predict(obs, deterministic=True)
-            obs, reward, done, truncated, info = env.step(action)
-
-            violations["total_steps"] += 1
-
-            # Check safety violations
-            if np.any(np.abs(action) > env.max_torque):  # Torque
-                violations["torque_violations"] += 1
-            if np.any(np.abs(obs[3:6]) > env.max_joint_velocity):  # Velocity
-                violations["velocity_violations"] += 1
-            if np.any(np.abs(obs[6:9]) > env.workspace_bounds):  # Workspace
-                violations["workspace_violations"] += 1
-
-    return violations
-
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,62 @@
+-- SafeRL ProofStack: PPO Safety Specification
+-- Generated automatically from Python safety constraints
+
+import Mathlib.Data.Real.Basic
+import Mathlib.Analysis.NormedSpace.Basic
+
+-- State representation
+structure State where
+  cart_position : ℝ
+  cart_velocity : ℝ
+  pole_angle : ℝ
+  pole_angular_velocity : ℝ
+
+-- Action representation
+structure Action where
+  force : ℝ
+
+-- Policy function type
+def Policy := State → Action
+
+-- Safety invariants (must always hold)
+-- Default invariants
+def default_invariant (σ : State) : Prop :=
+  |σ.cart_position| ≤ 2.4 ∧
+  |σ.pole_angle| ≤ 0.2095
+
+-- Guard conditions (checked before actions)
+-- Default guards
+def default_guard (σ : State) (a : Action) : Prop :=
+  |σ.cart_position| ≤ 2.3 ∧
+  |σ.pole_angle| ≤ 0.2 ∧
+  |a.force| ≤ 10.0
+
+-- Safety lemmas for proof generation
+-- Default lemmas
+lemma position_step_bound : ∀ σ, invariant σ → |σ.cart_position| ≤ 2.4 := by
+  intro σ h_inv
+  exact h_inv.left
+
+lemma angle_step_preserved : ∀ σ, invariant σ → |σ.pole_angle| ≤ 0.2095 := by
+  intro σ h_inv
+  exact h_inv.right
+
+-- Main safety theorem for PPO
+-- PPO-specific safety theorem
+axiom ppo_policy : Policy
+theorem safe_ppo_policy : ∀ σ, invariant σ → safe_action (ppo_policy σ) := by
+  intro σ h_invariant
+  exact by simp
+
+-- Helper definitions
+def safe_action (a : Action) : Prop :=
+  |a.force| ≤ 10.0
+
+def invariant (σ : State) : Prop :=
+  |σ.cart_position| ≤ 2.4 ∧
+  |σ.pole_angle| ≤ 0.2095
+
+-- Proof placeholder
+theorem safety_proof : ∀ σ, invariant σ → safe_action (safe_ppo_policy σ) := by
+  by
+    exact by simp
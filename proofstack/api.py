@@ -1,11 +1,14 @@
 """FastAPI server for SafeRL ProofStack REST API."""
 
+import asyncio
+import os
 import tempfile
+import uuid
 from pathlib import Path
 from typing import Any, Optional
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import BackgroundTasks, FastAPI, HTTPException
 from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
 
@@ -18,6 +21,13 @@ from .pipeline import ProofPipeline
 configure_logging()
 LOGGER = get_logger(__name__)
 BUNDLE_REGISTRY: dict[str, Path] = {}
+BUNDLE_JOBS: dict[str, dict[str, Any]] = {}
+# Server-side directory every bundle run writes under; a request's output_dir
+# only selects a subdirectory of it. Runs are kept for download, never pruned.
+BUNDLE_ROOT = Path("bundles")
+# Job records kept for status polling; the oldest finished ones go first.
+MAX_BUNDLE_JOBS = 1024
+_FINISHED = ("completed", "failed")
 
 app = FastAPI(
     title="SafeRL ProofStack API",
@@ -37,6 +47,7 @@ class TrainRequest(BaseModel):
     env: str = Field(default="CartPole-v1", min_length=1, max_length=128)
     wandb: bool = False
     output_dir: str = "./rl"
+    n_envs: int = Field(default=1, ge=1, le=64)
 
 
 class BundleRequest(BaseModel):
@@ -45,6 +56,10 @@ class BundleRequest(BaseModel):
     algorithm: str = Field(default="ppo")
 
 
+class BatchBundleRequest(BaseModel):
+    items: list[BundleRequest] = Field(..., min_length=1, max_length=64)
+
+
 class SafetySpec(BaseModel):
     environment: str
     invariants: list[str]
@@ -62,6 +77,9 @@ async def root():
             "POST /init": "Initialize a new project",
             "POST /train": "Train an RL agent",
             "POST /bundle": "Generate safety bundle",
+            "POST /bundle/batch": "Generate several safety bundles in one call",
+            "POST /bundle/jobs": "Queue a safety bundle in the background",
+            "GET /bundle/status/{job_id}": "Poll a queued bundle job",
             "GET /bundle/{bundle_id}": "Download bundle artifacts",
         },
     }
@@ -107,6 +125,7 @@ async def train_agent(request: TrainRequest):
             env=request.env,
             wandb=request.wandb,
             output_dir=request.output_dir,
+            n_envs=request.n_envs,
         )
 
         # Find the generated model file
@@ -136,30 +155,19 @@ async def train_agent(request: TrainRequest):
 async def generate_bundle(request: BundleRequest):
     """Generate safety proof bundle."""
     try:
-        api_key = check_fireworks_key()
-        if not api_key:
-            raise HTTPException(
-                status_code=400,
-                detail="FIREWORKS_API_KEY environment variable not set",
-            )
+        api_key = _require_api_key()
         if request.algorithm not in SUPPORTED_ALGORITHMS:
             raise HTTPException(status_code=422, detail="Unsupported algorithm")
         spec = load_safety_spec(Path(request.spec_file))
 
-        # Create pipeline and run
-        pipeline = ProofPipeline(None, spec, api_key)
-        bundle = pipeline.run(algo=request.algorithm)
-        bundle_id = f"bundle-{len(BUNDLE_REGISTRY) + 1}"
-        BUNDLE_REGISTRY[bundle_id] = Path(bundle.path)
-        log_event(LOGGER, "bundle_generated", bundle_id=bundle_id, bundle_path=bundle.path)
-
-        return {
-            "status": "success",
-            "message": "Bundle generated successfully",
-            "bundle_id": bundle_id,
-            "bundle_path": bundle.path,
-            "artifacts": list_artifacts(bundle.path),
-        }
+        # Create pipeline and run it on a worker thread so the event loop
+        # keeps serving other requests during prover calls and hashing. Its
+        # own work dir keeps concurrent requests off each other's artifacts.
+        pipeline = ProofPipeline(
+            None, spec, api_key, work_dir=_new_work_dir(request.output_dir)
+        )
+        bundle = await asyncio.to_thread(pipeline.run, algo=request.algorithm)
+        return _register_bundle(bundle)
     except ValidationError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
     except HTTPException:
@@ -168,6 +176,139 @@ async def generate_bundle(request: BundleRequest):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@app.post("/bundle/batch")
+async def generate_bundle_batch(request: BatchBundleRequest):
+    """Generate several safety proof bundles, sharing setup across items.
+
+    The API key is checked once and each distinct spec file is loaded once.
+    Every item runs in its own work directory under its ``output_dir``
+    (inside BUNDLE_ROOT), so items never overwrite each other's artifacts.
+    Results are returned in request order; a failing item reports its error
+    without aborting the rest.
+    """
+    api_key = _require_api_key()
+
+    specs: dict[str, Any] = {}
+    results = []
+    for item in request.items:
+        try:
+            if item.algorithm not in SUPPORTED_ALGORITHMS:
+                raise ValidationError(f"Unsupported algorithm: {item.algorithm}")
+            spec = specs.get(item.spec_file)
+            if spec is None:
+                spec = specs[item.spec_file] = load_safety_spec(Path(item.spec_file))
+            pipeline = ProofPipeline(
+                None, spec, api_key, work_dir=_new_work_dir(item.output_dir)
+            )
+            bundle = await asyncio.to_thread(pipeline.run, algo=item.algorithm)
+            results.append(_register_bundle(bundle))
+        except Exception as exc:
+            log_event(
+                LOGGER,
+                "batch_bundle_item_failed",
+                spec_file=item.spec_file,
+                error=str(exc),
+            )
+            results.append({"status": "error", "detail": str(exc)})
+    return {"results": results}
+
+
+@app.post("/bundle/jobs", status_code=202)
+async def submit_bundle_job(request: BundleRequest, background_tasks: BackgroundTasks):
+    """Queue a safety proof bundle and return immediately with a job id."""
+    api_key = _require_api_key()
+    if request.algorithm not in SUPPORTED_ALGORITHMS:
+        raise HTTPException(status_code=422, detail="Unsupported algorithm")
+    try:
+        work_dir = _new_work_dir(request.output_dir)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    job_id = uuid.uuid4().hex
+    job = BUNDLE_JOBS[job_id] = {"job_id": job_id, "status": "pending"}
+    _evict_bundle_jobs()
+    background_tasks.add_task(_run_bundle_job, job, request, api_key, work_dir)
+    return {"job_id": job_id, "status_url": f"/bundle/status/{job_id}"}
+
+
+@app.get("/bundle/status/{job_id}")
+async def bundle_job_status(job_id: str):
+    """Report the state of a queued bundle job."""
+    job = BUNDLE_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    return job
+
+
+def _evict_bundle_jobs() -> None:
+    """Drop job records beyond MAX_BUNDLE_JOBS, oldest finished ones first."""
+    excess = len(BUNDLE_JOBS) - MAX_BUNDLE_JOBS
+    if excess <= 0:
+        return
+    # Insertion order plus a stable sort gives oldest-first within each
+    # group. A running job holds its own record, so evicting it only stops
+    # its status from being pollable.
+    by_age = sorted(
+        BUNDLE_JOBS,
+        key=lambda job_id: BUNDLE_JOBS[job_id]["status"] not in _FINISHED,
+    )
+    for job_id in by_age[:excess]:
+        del BUNDLE_JOBS[job_id]
+
+
+async def _run_bundle_job(
+    job: dict[str, Any], request: BundleRequest, api_key: str, work_dir: Path
+) -> None:
+    job["status"] = "running"
+    try:
+        spec = load_safety_spec(Path(request.spec_file))
+        pipeline = ProofPipeline(None, spec, api_key, work_dir=work_dir)
+        bundle = await asyncio.to_thread(pipeline.run, algo=request.algorithm)
+    except Exception as exc:
+        log_event(LOGGER, "bundle_job_failed", job_id=job["job_id"], error=str(exc))
+        job.update(status="failed", detail=str(exc))
+        return
+    job.update(status="completed", result=_register_bundle(bundle))
+
+
+def _new_work_dir(output_dir: str) -> Path:
+    """Fresh directory for one pipeline run's artifacts, under BUNDLE_ROOT.
+
+    ``output_dir`` is client-supplied, so it must be a relative path that
+    stays inside BUNDLE_ROOT.
+    """
+    subdir = Path(output_dir)
+    if subdir.anchor or ".." in subdir.parts:
+        raise ValidationError(
+            f"output_dir must be a relative path without '..': {output_dir}"
+        )
+    return BUNDLE_ROOT / subdir / uuid.uuid4().hex
+
+
+def _require_api_key() -> str:
+    api_key = check_fireworks_key()
+    if not api_key:
+        raise HTTPException(
+            status_code=400,
+            detail="FIREWORKS_API_KEY environment variable not set",
+        )
+    return api_key
+
+
+def _register_bundle(bundle) -> dict[str, Any]:
+    bundle_id = f"bundle-{len(BUNDLE_REGISTRY) + 1}"
+    BUNDLE_REGISTRY[bundle_id] = Path(bundle.path)
+    log_event(LOGGER, "bundle_generated", bundle_id=bundle_id, bundle_path=bundle.path)
+
+    return {
+        "status": "success",
+        "message": "Bundle generated successfully",
+        "bundle_id": bundle_id,
+        "bundle_path": bundle.path,
+        "artifacts": list_artifacts(bundle.path),
+    }
+
+
 @app.get("/bundle/{bundle_id}")
 async def download_bundle(bundle_id: str, artifact: Optional[str] = None):
     """Download bundle artifacts."""
@@ -227,19 +368,22 @@ async def create_spec(spec: SafetySpec):
 
 def list_artifacts(bundle_path: str) -> dict[str, Any]:
     """List artifacts in a bundle."""
-    bundle_dir = Path(bundle_path)
-    if not bundle_dir.exists():
+    try:
+        entries = os.scandir(bundle_path)
+    except FileNotFoundError:
         return {}
 
-    artifacts = {}
-    for file_path in bundle_dir.glob("*"):
-        if file_path.is_file():
-            artifacts[file_path.name] = {
-                "size": file_path.stat().st_size,
-                "type": file_path.suffix,
+    # DirEntry carries the file type from readdir, so only regular files cost
+    # a stat() call. Dotfiles are skipped, as the previous glob("*") did.
+    with entries:
+        return {
+            entry.name: {
+                "size": entry.stat().st_size,
+                "type": os.path.splitext(entry.name)[1],
             }
-
-    return artifacts
+            for entry in entries
+            if not entry.name.startswith(".") and entry.is_file()
+        }
 
 
 if __name__ == "__main__":
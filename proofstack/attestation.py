@@ -1,75 +1,199 @@
 import hashlib
-import json
+import html
+import inspect
+import mmap
 import os
+import shutil
 
 # from weasyprint import HTML  # Temporarily disabled
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
+import orjson
+
+from .cache import CACHE_DIR, write_atomic
 from .compliance_mapper import ComplianceMapper
 from .errors import ArtifactGenerationError, ValidationError
 from .observability import get_logger, log_event
 
 LOGGER = get_logger(__name__)
 
+_HASH_CHUNK_SIZE = 1 << 20  # 1 MiB
+_hash_buffers = threading.local()
+
+_HTML_REPORT_TEMPLATE = b"""
+        <html><body><h1>ProofStack Attestation</h1>
+        <h2>Spec</h2><pre>%s</pre>
+        </body></html>
+        """
+
+# Identifies how lean_project.sha256 was computed; recorded next to the digest
+# in lean_project.sha256.json so verifiers know which algorithm to replay.
+LEAN_HASH_SCHEME = "sha256-path-digest-v1"
+
+_COMPLIANCE_CACHE_DIR = CACHE_DIR / "compliance"
+# Cached compliance.json files kept; the least recently used go first.
+_COMPLIANCE_CACHE_MAX_ENTRIES = 64
+
+# Resolved once: probing for the tool on every bundle costs a fork/exec.
+_CYCLONEDX_BOM = shutil.which("cyclonedx-bom")
+
+# Deterministic minimal SPDX document used when cyclonedx-bom is unavailable.
+_FALLBACK_SBOM = orjson.dumps(
+    {
+        "SPDXID": "SPDXRef-DOCUMENT",
+        "spdxVersion": "SPDX-2.3",
+        "name": "SafeRL ProofStack Bundle",
+        "packages": [
+            {
+                "SPDXID": "SPDXRef-safety-specification",
+                "name": "Safety Specification",
+                "versionInfo": "1.0.0",
+                "description": "Formal safety requirements specification",
+            },
+            {
+                "SPDXID": "SPDXRef-configuration-management",
+                "name": "Configuration Management",
+                "versionInfo": "1.0.0",
+                "description": "Configuration management system",
+            },
+            {
+                "SPDXID": "SPDXRef-security-monitoring",
+                "name": "Security Monitoring",
+                "versionInfo": "1.0.0",
+                "description": "Security monitoring and logging system",
+            },
+        ],
+    },
+    option=orjson.OPT_INDENT_2,
+)
+
+
+def _sha256_file(path) -> bytes:
+    """SHA256 digest of one file.
+
+    Files of at least one chunk are hashed straight from an mmap of the page
+    cache; smaller ones (where mapping costs more than it saves) are read
+    through a per-thread 1 MiB buffer.
+    """
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size >= _HASH_CHUNK_SIZE:
+            try:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    sha256.update(mapped)
+                return sha256.digest()
+            except (OSError, ValueError):
+                pass  # not mappable (e.g. special filesystem); read instead
+        buffer = getattr(_hash_buffers, "buffer", None)
+        if buffer is None:
+            buffer = _hash_buffers.buffer = bytearray(_HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while n := file.readinto(buffer):
+            sha256.update(view[:n])
+    return sha256.digest()
+
+
+# A cached mapping is only as current as the control tables and mapper code
+# that produced it, both of which live in compliance_mapper; keying on that
+# module's source means an upgrade never serves an outdated compliance.json.
+_COMPLIANCE_MAPPER_DIGEST = _sha256_file(inspect.getfile(ComplianceMapper))
+
+
+def _iter_lean_files(root):
+    """Yield Lean source/object files under ``root`` in os.walk order."""
+    subdirs = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name.endswith((".lean", ".olean")):
+                yield entry.path
+    for subdir in subdirs:
+        yield from _iter_lean_files(subdir)
+
+
+def _compliance_inputs_key(paths, test_results, algorithm) -> Optional[str]:
+    """Digest of everything the compliance mapping depends on (None if incomplete)."""
+    sha256 = hashlib.sha256(_COMPLIANCE_MAPPER_DIGEST)
+    try:
+        for path in paths:
+            sha256.update(_sha256_file(path))
+    except FileNotFoundError:
+        return None  # let the mapper report the missing artifact
+    sha256.update(orjson.dumps(test_results, option=orjson.OPT_SORT_KEYS))
+    sha256.update(algorithm.encode("utf-8"))
+    return sha256.hexdigest()
+
+
+def _prune_compliance_cache(cache_dir: Path) -> None:
+    """Keep only the newest ``_COMPLIANCE_CACHE_MAX_ENTRIES`` cached mappings."""
+    entries = []
+    for path in cache_dir.glob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime_ns, path))
+        except FileNotFoundError:
+            pass  # removed by a concurrent prune
+    entries.sort(reverse=True)
+    for _, path in entries[_COMPLIANCE_CACHE_MAX_ENTRIES:]:
+        path.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=8)
+def _shared_compliance_mapper(cwd: str) -> ComplianceMapper:
+    """One read-only mapper per working directory, shared by all bundles.
+
+    The mapper resolves its relative ``opencontrol`` directory against the
+    cwd, so that is the cache key.
+    """
+    return ComplianceMapper()
+
 
 class Attestation:
     """
     Generates compliance artifacts: HTML report, SBOM, PDF, cryptographic hashes, compliance mapping, and bundles them.
     """
 
-    def __init__(self, out_dir="attestation_bundle"):
+    def __init__(
+        self, out_dir="attestation_bundle", project_dir=".", compliance_cache_dir=None
+    ):
         self.out_dir = Path(out_dir)
-        self.out_dir.mkdir(exist_ok=True)
-        self.compliance_mapper = ComplianceMapper()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        # Lean project hashed into lean_project.sha256 by bundle()
+        self.project_dir = project_dir
+        self.compliance_cache_dir = Path(
+            compliance_cache_dir
+            if compliance_cache_dir is not None
+            else _COMPLIANCE_CACHE_DIR
+        )
+        self.compliance_mapper = _shared_compliance_mapper(os.getcwd())
 
     def generate_html_report(self, spec):
         html_path = self.out_dir / "attestation.html"
-        html_content = f"""
-        <html><body><h1>ProofStack Attestation</h1>
-        <h2>Spec</h2><pre>{spec}</pre>
-        </body></html>
-        """
-        html_path.write_text(html_content)
+        # Escape the spec: its repr may contain markup-significant characters.
+        spec_html = html.escape(str(spec)).encode("utf-8")
+        html_path.write_bytes(_HTML_REPORT_TEMPLATE % spec_html)
         return html_path
 
     def generate_sbom(self):
         sbom_path = self.out_dir / "sbom.spdx.json"
-        try:
-            subprocess.run(["cyclonedx-bom", "-o", str(sbom_path)], check=True)
-        except Exception:
-            # Fallback to a deterministic minimal SPDX document when tool is unavailable.
-            basic_sbom = {
-                "SPDXID": "SPDXRef-DOCUMENT",
-                "spdxVersion": "SPDX-2.3",
-                "name": "SafeRL ProofStack Bundle",
-                "packages": [
-                    {
-                        "SPDXID": "SPDXRef-safety-specification",
-                        "name": "Safety Specification",
-                        "versionInfo": "1.0.0",
-                        "description": "Formal safety requirements specification",
-                    },
-                    {
-                        "SPDXID": "SPDXRef-configuration-management",
-                        "name": "Configuration Management",
-                        "versionInfo": "1.0.0",
-                        "description": "Configuration management system",
-                    },
-                    {
-                        "SPDXID": "SPDXRef-security-monitoring",
-                        "name": "Security Monitoring",
-                        "versionInfo": "1.0.0",
-                        "description": "Security monitoring and logging system",
-                    },
-                ],
-            }
-            sbom_path.write_text(json.dumps(basic_sbom, indent=2))
-            log_event(
-                LOGGER,
-                "sbom_fallback_used",
-                output_path=str(sbom_path),
-            )
+        if _CYCLONEDX_BOM is not None:
+            try:
+                subprocess.run([_CYCLONEDX_BOM, "-o", str(sbom_path)], check=True)
+                return sbom_path
+            except Exception:
+                pass
+        sbom_path.write_bytes(_FALLBACK_SBOM)
+        log_event(
+            LOGGER,
+            "sbom_fallback_used",
+            output_path=str(sbom_path),
+        )
         return sbom_path
 
     def generate_pdf(self, html_path):
@@ -79,22 +203,42 @@ class Attestation:
         return pdf_path
 
     def generate_hash(self, target_dir="."):
+        """Hash every .lean/.olean file under ``target_dir`` into one root digest.
+
+        Files are hashed concurrently (hashlib releases the GIL). The root is
+        SHA256 over ``relative_path NUL file_digest`` records in sorted path
+        order, so it is independent of directory listing order. That scheme
+        is recorded as ``LEAN_HASH_SCHEME`` in ``lean_project.sha256.json``
+        alongside the digest.
+        """
         hash_path = self.out_dir / "lean_project.sha256"
-        sha256 = hashlib.sha256()
-        for root, _, files in os.walk(target_dir):
-            for f in files:
-                if f.endswith(".lean") or f.endswith(".olean"):
-                    with open(os.path.join(root, f), "rb") as file:
-                        while chunk := file.read(8192):
-                            sha256.update(chunk)
+        paths = sorted(
+            Path(path).relative_to(target_dir).as_posix()
+            for path in _iter_lean_files(target_dir)
+        )
+        with ThreadPoolExecutor() as pool:
+            digests = pool.map(
+                _sha256_file, [os.path.join(target_dir, path) for path in paths]
+            )
+            sha256 = hashlib.sha256()
+            for path, digest in zip(paths, digests):
+                sha256.update(path.encode("utf-8") + b"\0" + digest)
         hash_path.write_text(sha256.hexdigest())
+        write_atomic(
+            hash_path.with_name(hash_path.name + ".json"),
+            orjson.dumps(
+                {"hash_scheme": LEAN_HASH_SCHEME, "sha256": sha256.hexdigest()},
+                option=orjson.OPT_INDENT_2,
+            ),
+        )
         return hash_path
 
     def generate_compliance_mapping(
-        self, spec, guardgen, algorithm: str = "ppo"
+        self, spec, guardgen, algorithm: str = "ppo", sbom_path=None
     ) -> Path:
         """
         Generate compliance mapping linking control objectives to specific artifacts.
+        ``sbom_path`` defaults to the bundle's sbom.spdx.json.
         Returns path to compliance.json file.
         """
         if not hasattr(spec, "invariants") or not hasattr(spec, "guard"):
@@ -105,45 +249,89 @@ class Attestation:
             "security_tests": {"status": "passed", "coverage": 100},
         }
 
+        lean_file_path = str(
+            getattr(spec, "lean_file_path", None) or "lean_output/safety_proof.lean"
+        )
+        guard_file_path = str(self.out_dir / "guard.c")
+        sbom_file_path = str(sbom_path or self.out_dir / "sbom.spdx.json")
+        compliance_path = self.out_dir / "compliance.json"
+
+        # Apart from its timestamps the mapping is a pure function of these
+        # inputs, so reuse the last result whenever none of them changed.
+        inputs_key = _compliance_inputs_key(
+            (lean_file_path, guard_file_path, sbom_file_path), test_results, algorithm
+        )
+        cached_path = None
+        if inputs_key is not None:
+            cached_path = self.compliance_cache_dir / f"{inputs_key}.json"
+            try:
+                cached = cached_path.read_bytes()
+            except FileNotFoundError:
+                pass
+            else:
+                self.compliance_mapper.write_restamped_compliance_json(
+                    cached, compliance_path
+                )
+                try:
+                    os.utime(cached_path)  # mark as recently used for pruning
+                except FileNotFoundError:
+                    pass  # pruned by a concurrent run
+                log_event(LOGGER, "compliance_mapping_cache_hit", key=inputs_key)
+                return compliance_path
+
         # Generate compliance report
         compliance_report = self.compliance_mapper.map_artifacts_to_controls(
-            lean_file_path="lean_output/safety_proof.lean",
-            guard_file_path=str(self.out_dir / "guard.c"),
-            sbom_file_path=str(self.out_dir / "sbom.spdx.json"),
+            lean_file_path=lean_file_path,
+            guard_file_path=guard_file_path,
+            sbom_file_path=sbom_file_path,
             test_results=test_results,
             algorithm=algorithm,
         )
 
         # Generate compliance.json
-        compliance_json = self.compliance_mapper.generate_compliance_json(
-            compliance_report
-        )
-        compliance_path = self.out_dir / "compliance.json"
-        compliance_path.write_text(compliance_json)
+        self.compliance_mapper.write_compliance_json(compliance_report, compliance_path)
+        if cached_path is not None:
+            write_atomic(cached_path, compliance_path.read_bytes())
+            _prune_compliance_cache(self.compliance_cache_dir)
 
         return compliance_path
 
-    def bundle(self, spec, guardgen, algorithm: str = "ppo"):
+    def bundle(
+        self, spec, guardgen, algorithm: str = "ppo", sbom_path=None, guard_path=None
+    ):
         """
         Bundles the spec, guard code, and compliance artifacts into a single package.
         Now includes compliance mapping with artifact lineage.
+        Pass ``sbom_path`` when the SBOM was already produced (e.g. by an
+        earlier generate_sbom() call); it is copied into the bundle if it
+        lives elsewhere. Likewise pass ``guard_path`` when guardgen.emit_c()
+        already ran, so the guard is not rendered again.
         Returns a bundle object (with .path attribute).
         """
         html = self.generate_html_report(spec)
-        self.generate_sbom()
+        if sbom_path is None:
+            sbom_path = self.generate_sbom()
+        else:
+            bundled_sbom = self.out_dir / "sbom.spdx.json"
+            sbom_source = Path(sbom_path)
+            if not sbom_source.exists():
+                raise ArtifactGenerationError(f"SBOM artifact not found: {sbom_path}")
+            if sbom_source.resolve() != bundled_sbom.resolve():
+                bundled_sbom.write_bytes(sbom_source.read_bytes())
+            sbom_path = bundled_sbom
         self.generate_pdf(html)
-        self.generate_hash()
+        self.generate_hash(self.project_dir)
 
-        # Generate guard code and copy into bundle.
-        guard_file = guardgen.emit_c(spec)
+        # Generate guard code (unless given) and copy into bundle.
+        guard_file = guard_path if guard_path is not None else guardgen.emit_c(spec)
         guard_c_path = self.out_dir / "guard.c"
         guard_source = Path(guard_file)
         if not guard_source.exists():
             raise ArtifactGenerationError("Guard generator did not produce a valid file.")
-        guard_c_path.write_text(guard_source.read_text(encoding="utf-8"), encoding="utf-8")
+        guard_c_path.write_bytes(guard_source.read_bytes())
 
         # Generate compliance mapping with artifact lineage
-        self.generate_compliance_mapping(spec, guardgen, algorithm)
+        self.generate_compliance_mapping(spec, guardgen, algorithm, sbom_path)
 
         class Bundle:
             path = str(self.out_dir)
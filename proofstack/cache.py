@@ -1,12 +1,71 @@
 import hashlib
-import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
+
+import orjson
 
 CACHE_DIR = Path(".proofstack_cache")
 CACHE_DIR.mkdir(exist_ok=True)
 
 
+# (spec_sha256, algo, mathlib_commit)
+CacheKey = tuple[str, str, str]
+
+
+@lru_cache(maxsize=256)
+def _key_digest(key: CacheKey) -> str:
+    """SHA256 of a cache key; memoized since the same keys recur across get/set.
+
+    Components are NUL-separated, so no two distinct keys share a digest.
+    """
+    return hashlib.sha256("\0".join(key).encode("utf-8")).hexdigest()
+
+
+_SHARD_NAME = re.compile(r"[0-9a-f]{2}\Z")
+_ENTRY_NAME = re.compile(r"[0-9a-f]{64}\.json\Z")
+
+
+def _shard_dirs(parent: Path) -> list[str]:
+    """Paths of the two-hex-digit shard directories directly under ``parent``."""
+    with os.scandir(parent) as entries:
+        return [
+            entry.path
+            for entry in entries
+            if _SHARD_NAME.match(entry.name) and entry.is_dir(follow_symlinks=False)
+        ]
+
+
+def _rmdir_if_empty(path: str) -> None:
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass  # shard still holds non-cache files
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a sibling temp file and an atomic rename.
+
+    Readers (including other processes sharing a cache directory) see either
+    the previous file or the complete new one, never a partial write.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
 class ProofCache:
     """
     Lazy proof-sketch cache for Lean proofs.
@@ -14,31 +73,56 @@ class ProofCache:
     Stores proof sketches as JSON files in .proofstack_cache/.
     """
 
-    def __init__(self, cache_dir: Path = CACHE_DIR):
+    def __init__(self, cache_dir: Path = CACHE_DIR, memory_size: int = 512):
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # In-process LRU in front of the filesystem for recently used entries.
+        # Keyed by the component tuple so hot hits skip digest/path building.
+        # Entries are the serialized JSON, so every hit returns a fresh dict
+        # and callers mutating a result cannot corrupt later hits.
+        self._mem: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._mem_size = memory_size
+        # Guards the LRU's multi-step updates (move/evict) across threads.
+        self._mem_lock = threading.Lock()
+        # Write-back state for set_async(): entries stay readable from
+        # _pending until the background writer has persisted them.
+        self._pending: dict[CacheKey, bytes] = {}
+        self._pending_lock = threading.Lock()
+        self._futures: list[Future] = []
+        self._writer: Optional[ThreadPoolExecutor] = None
 
-    def _cache_key(self, spec_sha256: str, algo: str, mathlib_commit: str) -> str:
-        return f"{spec_sha256}_{algo}_{mathlib_commit}"
+    def _cache_key(self, spec_sha256: str, algo: str, mathlib_commit: str) -> CacheKey:
+        return (spec_sha256, algo, mathlib_commit)
 
-    def _cache_path(self, key: str) -> Path:
+    def _cache_path(self, key: CacheKey) -> Path:
         # Hash keys so algo/mathlib segments cannot inject path separators or reserved names.
-        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
-        return self.cache_dir / f"{digest}.json"
+        # Shard by the top 16 bits of the digest so no single directory grows unbounded.
+        digest = _key_digest(key)
+        return self.cache_dir / digest[:2] / digest[2:4] / f"{digest}.json"
 
     def get(
         self, spec_sha256: str, algo: str, mathlib_commit: str
     ) -> Optional[dict[str, Any]]:
         """Return cached proof sketch if present, else None."""
         key = self._cache_key(spec_sha256, algo, mathlib_commit)
-        path = self._cache_path(key)
-        if path.exists():
-            try:
-                with open(path, encoding="utf-8") as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                return None
-        return None
+        with self._mem_lock:
+            cached = self._mem.get(key)
+            if cached is not None:
+                self._mem.move_to_end(key)
+        if cached is not None:
+            return orjson.loads(cached)
+        with self._pending_lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            return orjson.loads(pending)
+        try:
+            with open(self._cache_path(key), "rb") as f:
+                data = f.read()
+            proof_sketch = orjson.loads(data)
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return None
+        self._remember(key, data)
+        return proof_sketch
 
     def set(
         self,
@@ -49,16 +133,94 @@ class ProofCache:
     ) -> None:
         """Store proof sketch in cache."""
         key = self._cache_key(spec_sha256, algo, mathlib_commit)
-        path = self._cache_path(key)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(proof_sketch, f, indent=2)
+        data = self._serialize(proof_sketch)
+        with self._pending_lock:
+            # A synchronous write supersedes any queued write for the same key.
+            self._pending.pop(key, None)
+        write_atomic(self._cache_path(key), data)
+        self._remember(key, data)
+
+    def set_async(
+        self,
+        spec_sha256: str,
+        algo: str,
+        mathlib_commit: str,
+        proof_sketch: dict[str, Any],
+    ) -> None:
+        """Queue a proof sketch for a background write; call flush() to wait for it."""
+        key = self._cache_key(spec_sha256, algo, mathlib_commit)
+        data = self._serialize(proof_sketch)
+        self._remember(key, data)
+        with self._pending_lock:
+            self._pending[key] = data
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="proofcache-writer"
+                )
+            self._futures.append(self._writer.submit(self._write_back, key))
+
+    def flush(self) -> None:
+        """Block until all queued set_async() writes are on disk."""
+        with self._pending_lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def _remember(self, key: CacheKey, data: bytes) -> None:
+        with self._mem_lock:
+            self._mem[key] = data
+            self._mem.move_to_end(key)
+            if len(self._mem) > self._mem_size:
+                self._mem.popitem(last=False)
+
+    def _write_back(self, key: CacheKey) -> None:
+        with self._pending_lock:
+            data = self._pending.get(key)
+        if data is None:
+            return
+        write_atomic(self._cache_path(key), data)
+        with self._pending_lock:
+            if self._pending.get(key) is data:
+                del self._pending[key]
+
+    @staticmethod
+    def _serialize(proof_sketch: dict[str, Any]) -> bytes:
+        # orjson emits compact UTF-8 JSON; non-str keys are coerced to strings
+        # the way the stdlib encoder did.
+        return orjson.dumps(proof_sketch, option=orjson.OPT_NON_STR_KEYS)
 
     def clear(self) -> None:
-        """Clear the entire cache."""
-        for file in self.cache_dir.glob("*.json"):
-            file.unlink()
+        """Clear the entire cache.
+
+        Removes the sharded ``<xx>/<yy>/<digest>.json`` entries (pruning shard
+        directories once empty) and the flat ``<digest>.json`` entries that
+        older versions wrote directly into ``cache_dir``. Other files and
+        subtrees in ``cache_dir`` (e.g. attestation's ``compliance/``) are
+        left alone.
+        """
+        self.flush()
+        with self._mem_lock:
+            self._mem.clear()
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if _ENTRY_NAME.match(entry.name) and entry.is_file():
+                    os.unlink(entry.path)
+        for outer in _shard_dirs(self.cache_dir):
+            for inner in _shard_dirs(outer):
+                with os.scandir(inner) as entries:
+                    for entry in entries:
+                        if _ENTRY_NAME.match(entry.name) and entry.is_file():
+                            os.unlink(entry.path)
+                _rmdir_if_empty(inner)
+            _rmdir_if_empty(outer)
 
     @staticmethod
-    def compute_spec_sha256(spec: str) -> str:
-        """Compute SHA256 hash of the spec string."""
-        return hashlib.sha256(spec.encode("utf-8")).hexdigest()
+    @lru_cache(maxsize=1024)
+    def compute_spec_sha256(spec: Union[str, bytes]) -> str:
+        """Compute SHA256 hash of the spec (memoized for repeated specs).
+
+        Callers that already hold UTF-8 bytes can pass them directly to skip
+        the ``str.encode`` round-trip; both forms hash to the same digest.
+        """
+        data = spec.encode("utf-8") if isinstance(spec, str) else spec
+        return hashlib.sha256(data).hexdigest()
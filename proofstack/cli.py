@@ -14,7 +14,6 @@ from rich.table import Table
 from .contracts import SUPPORTED_ALGORITHMS, load_safety_spec
 from .observability import configure_logging
 from .pipeline import ProofPipeline
-from .rl.algorithms import create_safe_algorithm
 
 app = typer.Typer(
     name="proofstack",
@@ -172,14 +171,20 @@ def train(
         False, "--wandb", help="Enable Weights & Biases logging"
     ),
     output_dir: str = typer.Option("./rl", "--output", "-o", help="Output directory"),
+    n_envs: int = typer.Option(
+        1, "--n-envs", min=1, help="Environment copies stepped per training step"
+    ),
 ):
     """Train an RL agent using SafeRL ProofStack algorithms."""
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Import here to avoid circular imports
+    # Imported here: torch and stable-baselines3 take seconds to load, and
+    # only training needs them.
     import gymnasium as gym
 
+    from .rl.algorithms import create_safe_algorithm
+
     # Validate algorithm
     supported_algos = ["ppo", "sac", "ddpg"]
     if algo not in supported_algos:
@@ -203,7 +208,7 @@ def train(
         )
 
         # Create safe algorithm adapter
-        safe_algo = create_safe_algorithm(algo, env_obj)
+        safe_algo = create_safe_algorithm(algo, env_obj, n_envs=n_envs)
 
         # Train with safety constraints
         safe_algo.train(total_timesteps=timesteps)
@@ -298,18 +303,20 @@ async def run_bundle_with_watch(
         lean_file_path = str(pipeline.spec.lean_file_path) if pipeline.spec.lean_file_path else ""
         async for update in pipeline.prover.stream(lean_file_path):
             progress.update(task, description=f"🤖 {update}")
-        proof = pipeline.prover.complete(lean_file)
+        proof = pipeline.prover.complete(Path(lean_file).read_text(encoding="utf-8"))
 
     task = progress.add_task("Writing proof to Lean file...", total=None)
     pipeline.spec.write_proof(proof)
     progress.update(task, description="✅ Proof written to Lean file")
 
     task = progress.add_task("Generating guard code...", total=None)
-    pipeline.guardgen.emit_c(pipeline.spec)
+    guard_path = pipeline.guardgen.emit_c(pipeline.spec)
     progress.update(task, description="✅ Guard code generated")
 
     task = progress.add_task("Creating attestation bundle...", total=None)
-    bundle = pipeline.attestation.bundle(pipeline.spec, pipeline.guardgen, algorithm=algo)
+    bundle = pipeline.attestation.bundle(
+        pipeline.spec, pipeline.guardgen, algorithm=algo, guard_path=guard_path
+    )
     progress.update(task, description="✅ Attestation bundle created")
 
     console.print("\n[green]🎉 Bundle generated successfully![/green]")
@@ -345,10 +352,13 @@ def run_bundle_sync(
         table.add_column("File", style="cyan")
         table.add_column("Size", style="magenta")
 
-        for file_path in bundle_path.glob("*"):
-            if file_path.is_file():
-                size = file_path.stat().st_size
-                table.add_row(file_path.name, f"{size} bytes")
+        # scandir yields DirEntry objects with cached type info, so listing
+        # the bundle costs one directory read instead of a stat per entry.
+        with os.scandir(bundle_path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    size = entry.stat().st_size
+                    table.add_row(entry.name, f"{size} bytes")
 
         console.print(table)
 
@@ -3,52 +3,16 @@
 import hashlib
 from pathlib import Path
 
+from .cache import write_atomic
 
-class GuardGen:
-    """Generates runtime guard code from safety specifications."""
-
-    def __init__(self):
-        """Initialize the guard code generator."""
-        self.output_dir = Path("guard_output")
-
-    def emit_c(self, spec) -> str:
-        """Generate C99 runtime guard code from safety specification.
-
-        Args:
-            spec: Safety specification object with invariants, guard, and lemmas
-
-        Returns:
-            Path to the generated C file
-        """
-        # Create output directory
-        output_dir = self.output_dir
-        output_dir.mkdir(exist_ok=True)
-
-        # Generate C code
-        c_code = self._generate_c_code(spec)
+# Constraint constants rendered into the emitted C.
+_MAX_POSITION = 2.4
+_MAX_ANGLE = 0.2095
+_MAX_FORCE = 10.0
 
-        # Write to file
-        c_file = output_dir / "guard.c"
-        c_file.write_text(c_code, encoding="utf-8")
-
-        return str(c_file)
-
-    def _generate_c_code(self, spec) -> str:
-        """Generate the actual C code content."""
-        # Handle both SpecGen objects and raw safety specs
-        if hasattr(spec, "safety_spec"):
-            # It's a SpecGen object, get the underlying spec
-            raw_spec = spec.safety_spec
-        else:
-            # It's already a raw spec
-            raw_spec = spec
-
-        # Create a hash of the specification for traceability
-        spec_content = f"{raw_spec.invariants}{raw_spec.guard}{raw_spec.lemmas}"
-        spec_hash = hashlib.sha256(spec_content.encode()).hexdigest()
-
-        c_code = f"""// Runtime Guard Code for SafeRL ProofStack
-// Generated from specification hash: {spec_hash}
+# Rendered once at import; only the spec hash varies between guards.
+_C_TEMPLATE = f"""// Runtime Guard Code for SafeRL ProofStack
+// Generated from specification hash: %(spec_hash)s
 
 #include <stdio.h>
 #include <stdlib.h>
@@ -69,9 +33,9 @@ typedef struct {{
 }} Action;
 
 // Configurable constraints generated from specification metadata.
-#define MAX_POSITION 2.4
-#define MAX_ANGLE 0.2095
-#define MAX_FORCE 10.0
+#define MAX_POSITION {_MAX_POSITION}
+#define MAX_ANGLE {_MAX_ANGLE}
+#define MAX_FORCE {_MAX_FORCE}
 
 // Safety predicate
 bool safe(State* state) {{
@@ -89,7 +53,7 @@ bool guard(State* state, Action* action) {{
 // Runtime guard function
 bool runtime_guard(State* state, Action* action) {{
     if (!guard(state, action)) {{
-        printf("Safety guard violation detected for spec hash {spec_hash}!\\n");
+        printf("Safety guard violation detected for spec hash %(spec_hash)s!\\n");
         return false;
     }}
     return true;
@@ -99,5 +63,59 @@ bool runtime_guard(State* state, Action* action) {{
 extern "C" bool check_safety(State* state, Action* action) {{
     return runtime_guard(state, action);
 }}
-"""
-        return c_code
+""".encode()
+
+
+class GuardGen:
+    """Generates runtime guard code from safety specifications."""
+
+    def __init__(self, output_dir="guard_output"):
+        """Initialize the guard code generator.
+
+        Args:
+            output_dir: Directory emit_c() writes guard.c into
+        """
+        self.output_dir = Path(output_dir)
+
+    def emit_c(self, spec) -> str:
+        """Generate C99 runtime guard code from safety specification.
+
+        Args:
+            spec: Safety specification object with invariants, guard, and lemmas
+
+        Returns:
+            Path to the generated C file
+        """
+        # Generate C code
+        c_code = self._generate_c_code(spec)
+
+        # Leave an identical guard untouched so its mtime only moves when the
+        # spec (or the template) changes and downstream builds stay cached.
+        c_file = self.output_dir / "guard.c"
+        try:
+            unchanged = c_file.read_bytes() == c_code
+        except FileNotFoundError:
+            unchanged = False
+        if not unchanged:
+            write_atomic(c_file, c_code)
+
+        return str(c_file)
+
+    def _generate_c_code(self, spec) -> bytes:
+        """Generate the actual C code content."""
+        # Handle both SpecGen objects and raw safety specs
+        if hasattr(spec, "safety_spec"):
+            # It's a SpecGen object, get the underlying spec
+            raw_spec = spec.safety_spec
+        else:
+            # It's already a raw spec
+            raw_spec = spec
+
+        # Create a hash of the specification for traceability. Fed piecewise,
+        # so no concatenated copy of the spec is built; the digest is the same.
+        sha256 = hashlib.sha256()
+        for part in (raw_spec.invariants, raw_spec.guard, raw_spec.lemmas):
+            sha256.update(str(part).encode())
+        spec_hash = sha256.hexdigest()
+
+        return _C_TEMPLATE % {b"spec_hash": spec_hash.encode()}
@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 from proofstack.attestation import Attestation
 from proofstack.cache import ProofCache
 from proofstack.guard_codegen import GuardGen
@@ -15,10 +18,18 @@ class ProofPipeline:
     """
 
     def __init__(
-        self, env, safety_spec, api_key, prover="fireworks/deepseek-prover-v2"
+        self,
+        env,
+        safety_spec,
+        api_key,
+        prover="fireworks/deepseek-prover-v2",
+        work_dir=None,
     ):
         self.env = env
-        self.spec = SpecGen()
+        # Every artifact directory lives under work_dir (default: the cwd), so
+        # pipelines with distinct work dirs can run side by side.
+        root = Path(work_dir) if work_dir is not None else Path()
+        self.spec = SpecGen(output_dir=root / "lean_output")
         # Populate spec fields from safety_spec dict if provided
         if safety_spec:
             if hasattr(safety_spec, "invariants"):
@@ -34,8 +45,10 @@ class ProofPipeline:
             elif isinstance(safety_spec, dict):
                 self.spec.lemmas = safety_spec.get("lemmas", [])
         self.prover = ProverAPI(api_key=api_key, model=prover)
-        self.attestation = Attestation()
-        self.guardgen = GuardGen()
+        self.attestation = Attestation(
+            out_dir=root / "attestation_bundle", project_dir=root
+        )
+        self.guardgen = GuardGen(output_dir=root / "guard_output")
         self.cache = ProofCache()
 
     def run(
@@ -49,21 +62,43 @@ class ProofPipeline:
         Returns the attestation bundle object.
         """
         lean_file = self.spec.emit_lean(algorithm_name=algo)
-        spec_sha256 = ProofCache.compute_spec_sha256(lean_file)
+        # The prover (and both caches) see the Lean source, never its path,
+        # which is the same for every spec and algorithm.
+        lean_code = Path(lean_file).read_text(encoding="utf-8")
         cache_hit = False
         proof = None
         if reuse_cache:
+            # Hashed once per run and reused for the probe and the write-back.
+            spec_sha256 = ProofCache.compute_spec_sha256(lean_code)
             cached = self.cache.get(spec_sha256, algo, mathlib_commit)
             if cached and "proof" in cached:
                 proof = cached["proof"]
                 cache_hit = True
-        if not proof:
-            proof = self.prover.complete(lean_file)
-            if reuse_cache:
-                self.cache.set(spec_sha256, algo, mathlib_commit, {"proof": proof})
+        # The guard and the SBOM do not depend on the proof, so they are
+        # produced on worker threads while the prover request is in flight on
+        # this one. Plain threads (not an event loop) keep run() callable from
+        # code that already has a loop running, such as Jupyter.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            guard_future = pool.submit(self.guardgen.emit_c, self.spec)
+            sbom_future = pool.submit(self.attestation.generate_sbom)
+            if not proof:
+                proof = self.prover.complete(lean_code)
+                if reuse_cache:
+                    # Persist in the background while the bundle is generated.
+                    self.cache.set_async(
+                        spec_sha256, algo, mathlib_commit, {"proof": proof}
+                    )
+            guard_path = guard_future.result()
+            sbom_path = sbom_future.result()
         self.spec.write_proof(proof)
-        self.guardgen.emit_c(self.spec)
-        bundle = self.attestation.bundle(self.spec, self.guardgen, algorithm=algo)
+        bundle = self.attestation.bundle(
+            self.spec,
+            self.guardgen,
+            algorithm=algo,
+            sbom_path=sbom_path,
+            guard_path=guard_path,
+        )
+        self.cache.flush()
         log_event(
             LOGGER,
             "pipeline_run_completed",
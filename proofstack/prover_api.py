@@ -1,26 +1,49 @@
 """Fireworks DeepSeek-Prover API integration for Lean proof completion."""
 
+import asyncio
+import hashlib
+import importlib.util
+from collections import OrderedDict
 from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Optional, Union
 
 import httpx
+import orjson
 
+from .cache import write_atomic
 from .errors import ProverAPIError, ProverNetworkError
 from .observability import get_logger, log_event
 
 LOGGER = get_logger(__name__)
 
+# HTTP/2 multiplexing needs the optional ``h2`` package (``httpx[http2]``).
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# Keep idle connections around long enough to span consecutive proof calls.
+_POOL_LIMITS = httpx.Limits(keepalive_expiry=120)
+
+
 class ProverAPI:
     """
     Client for Fireworks DeepSeek-Prover API.
     Handles Lean proof completion via hosted model.
     """
 
-    def __init__(self, api_key, model="fireworks/deepseek-prover-v2"):
+    def __init__(
+        self,
+        api_key,
+        model="fireworks/deepseek-prover-v2",
+        cache_dir: Optional[Union[str, Path]] = None,
+        memory_size: int = 256,
+    ):
         """Initialize the prover API client.
 
         Args:
             api_key: Fireworks API key
             model: Model to use for proof generation
+            cache_dir: Optional directory for a persistent completion cache,
+                content-addressed by SHA-256 of (model, Lean code)
+            memory_size: Number of completions kept in the in-process LRU
         """
         self.url = "https://api.fireworks.ai/inference/v1/chat/completions"
         self.headers = {
@@ -28,11 +51,114 @@ class ProverAPI:
             "Content-Type": "application/json",
         }
         self.model = model
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._completions: OrderedDict[str, str] = OrderedDict()
+        self._memory_size = memory_size
+
+    @property
+    def client(self) -> httpx.Client:
+        """Connection-pooling client reused across calls (one TLS handshake)."""
+        if self._client is None:
+            self._client = httpx.Client(
+                headers=self.headers,
+                timeout=120,
+                http2=_HTTP2_AVAILABLE,
+                limits=_POOL_LIMITS,
+            )
+        return self._client
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        # An AsyncClient's connections belong to the loop that opened them,
+        # so the pooled client is reused only within the same event loop.
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_client_loop is not loop:
+            stale, self._async_client = self._async_client, None
+            try:
+                await stale.aclose()
+            except Exception:
+                pass  # its loop is gone; the sockets died with it
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=60.0,
+                http2=_HTTP2_AVAILABLE,
+                limits=_POOL_LIMITS,
+            )
+            self._async_client_loop = loop
+        return self._async_client
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Release pooled connections, including the streaming client."""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
+
+    def __enter__(self) -> "ProverAPI":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def complete(self, lean_code):
         """
         Sends Lean code to the prover and returns the completed proof.
+
+        Completions are deterministic (temperature 0), so identical Lean code
+        is answered from the in-process LRU or ``cache_dir`` when possible.
         """
+        key = self._completion_key(lean_code)
+        content = self._cached_completion(key)
+        if content is None:
+            content = self._request_completion(lean_code)
+            if self.cache_dir is not None:
+                write_atomic(self.cache_dir / f"{key}.proof", content.encode("utf-8"))
+        self._remember_completion(key, content)
+        return content
+
+    def _completion_key(self, lean_code: str) -> str:
+        sha256 = hashlib.sha256(self.model.encode("utf-8"))
+        sha256.update(b"\0")
+        sha256.update(lean_code.encode("utf-8"))
+        return sha256.hexdigest()
+
+    def _cached_completion(self, key: str) -> Optional[str]:
+        content = self._completions.get(key)
+        if content is not None or self.cache_dir is None:
+            return content
+        try:
+            return (self.cache_dir / f"{key}.proof").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _remember_completion(self, key: str, content: str) -> None:
+        self._completions[key] = content
+        self._completions.move_to_end(key)
+        if len(self._completions) > self._memory_size:
+            self._completions.popitem(last=False)
+
+    def _request_completion(self, lean_code: str) -> str:
+        try:
+            r = self.client.post(self.url, content=self._completion_body(lean_code))
+            return self._completion_content(r)
+        except httpx.HTTPError as exc:
+            raise self._completion_error(exc) from exc
+
+    def _completion_body(self, lean_code: str) -> bytes:
+        # orjson emits UTF-8 bytes directly; Content-Type is a client header.
+        return orjson.dumps(self._completion_payload(lean_code))
+
+    def _completion_payload(self, lean_code: str) -> dict:
         messages = [
             {
                 "role": "system",
@@ -41,7 +167,7 @@ class ProverAPI:
             {"role": "user", "content": lean_code},
         ]
 
-        payload = {
+        return {
             "model": self.model,
             "messages": messages,
             "temperature": 0.0,
@@ -49,15 +175,18 @@ class ProverAPI:
             "max_tokens": 2048,
         }
 
-        try:
-            r = httpx.post(self.url, json=payload, headers=self.headers, timeout=120)
-            r.raise_for_status()
-            data = r.json()
-            content = data["choices"][0]["message"]["content"]
-            if not isinstance(content, str) or not content.strip():
-                raise ProverAPIError("Prover response contained empty proof content.")
-            return content
-        except httpx.HTTPStatusError as exc:
+    @staticmethod
+    def _completion_content(r: httpx.Response) -> str:
+        r.raise_for_status()
+        data = r.json()
+        content = data["choices"][0]["message"]["content"]
+        if not isinstance(content, str) or not content.strip():
+            raise ProverAPIError("Prover response contained empty proof content.")
+        return content
+
+    @staticmethod
+    def _completion_error(exc: httpx.HTTPError) -> Exception:
+        if isinstance(exc, httpx.HTTPStatusError):
             response_text = exc.response.text if exc.response else "no_response"
             log_event(
                 LOGGER,
@@ -65,12 +194,9 @@ class ProverAPI:
                 status_code=exc.response.status_code if exc.response else None,
                 response_text=response_text,
             )
-            raise ProverAPIError(
-                f"Prover API returned HTTP error: {exc}"
-            ) from exc
-        except httpx.HTTPError as exc:
-            log_event(LOGGER, "prover_api_network_error", error=str(exc))
-            raise ProverNetworkError(f"Prover API network failure: {exc}") from exc
+            return ProverAPIError(f"Prover API returned HTTP error: {exc}")
+        log_event(LOGGER, "prover_api_network_error", error=str(exc))
+        return ProverNetworkError(f"Prover API network failure: {exc}")
 
     async def stream(self, lean_file: str) -> AsyncIterator[str]:
         """Stream proof generation updates in real-time.
@@ -89,50 +215,49 @@ class ProverAPI:
             yield "🤖 Reading Lean specification..."
 
             # Make streaming API call
-            async with httpx.AsyncClient() as client:
-                async with client.stream(
-                    "POST",
-                    self.url,
-                    headers=self.headers,
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a Lean4 theorem prover. Complete the proof by replacing 'sorry' with valid Lean tactics.",
-                            },
-                            {"role": "user", "content": lean_code},
-                        ],
-                        "temperature": 0.0,
-                        "stream": True,
-                        "max_tokens": 2048,
-                    },
-                    timeout=60.0,
-                ) as response:
-                    response.raise_for_status()
-
-                    yield "🤖 Analyzing proof structure..."
-
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data = line[6:]  # Remove "data: " prefix
-                            if data == "[DONE]":
-                                break
-
-                            try:
-                                import json
-
-                                chunk = json.loads(data)
-                                if "choices" in chunk and chunk["choices"]:
-                                    delta = chunk["choices"][0].get("delta", {})
-                                    if "content" in delta:
-                                        content = delta["content"]
-                                        if content.strip():
-                                            yield f"🤖 {content.strip()}"
-                            except json.JSONDecodeError:
-                                continue
-
-                    yield "✅ Proof generation completed!"
+            client = await self._get_async_client()
+            async with client.stream(
+                "POST",
+                self.url,
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are a Lean4 theorem prover. Complete the proof by replacing 'sorry' with valid Lean tactics.",
+                        },
+                        {"role": "user", "content": lean_code},
+                    ],
+                    "temperature": 0.0,
+                    "stream": True,
+                    "max_tokens": 2048,
+                },
+                timeout=60.0,
+            ) as response:
+                response.raise_for_status()
+
+                yield "🤖 Analyzing proof structure..."
+
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        data = line[6:]  # Remove "data: " prefix
+                        if data == "[DONE]":
+                            break
+
+                        try:
+                            import json
+
+                            chunk = json.loads(data)
+                            if "choices" in chunk and chunk["choices"]:
+                                delta = chunk["choices"][0].get("delta", {})
+                                if "content" in delta:
+                                    content = delta["content"]
+                                    if content.strip():
+                                        yield f"🤖 {content.strip()}"
+                        except json.JSONDecodeError:
+                            continue
+
+                yield "✅ Proof generation completed!"
 
         except Exception as exc:
             log_event(LOGGER, "prover_stream_error", error=str(exc))
@@ -1,28 +1,95 @@
 """Multi-algorithm support for SafeRL ProofStack."""
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Optional
 
 import gymnasium as gym
 import numpy as np
+import torch as th
 from stable_baselines3 import DDPG, PPO, SAC
 from stable_baselines3.common.base_class import BaseAlgorithm
+from stable_baselines3.common.distributions import CategoricalDistribution
+from stable_baselines3.common.policies import ActorCriticPolicy
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+
+class MaskedActorCriticPolicy(ActorCriticPolicy):
+    """Actor-critic policy that masks unsafe discrete actions in the logits.
+
+    ``action_mask_fn`` maps a batch of observations to a boolean ``(batch, n)``
+    mask of safe actions (or ``None`` for no masking). Masked logits are
+    pushed to ``-1e9`` before the categorical distribution is built, so
+    unsafe actions are never sampled and log-probabilities used for the
+    policy gradient stay consistent with what was actually taken. The mask
+    is recomputed from the observation, so rollouts and updates agree
+    without storing it in the rollout buffer.
+    """
+
+    action_mask_fn: Optional[Callable[[np.ndarray], Optional[np.ndarray]]] = None
+    _mask_obs: Optional[th.Tensor] = None
+
+    def forward(self, obs, deterministic: bool = False):
+        return self._with_mask_obs(obs, super().forward, obs, deterministic)
+
+    def evaluate_actions(self, obs, actions):
+        return self._with_mask_obs(obs, super().evaluate_actions, obs, actions)
+
+    def get_distribution(self, obs):
+        return self._with_mask_obs(obs, super().get_distribution, obs)
+
+    def _with_mask_obs(self, obs, method, *args):
+        self._mask_obs = obs
+        try:
+            return method(*args)
+        finally:
+            self._mask_obs = None
+
+    def _get_action_dist_from_latent(self, latent_pi: th.Tensor):
+        distribution = super()._get_action_dist_from_latent(latent_pi)
+        if (
+            self.action_mask_fn is None
+            or self._mask_obs is None
+            or not isinstance(distribution, CategoricalDistribution)
+        ):
+            return distribution
+        mask = self.action_mask_fn(self._mask_obs.cpu().numpy())
+        if mask is None:
+            return distribution
+        mask = th.as_tensor(mask, dtype=th.bool, device=latent_pi.device)
+        # A state with no safe action keeps its unmasked distribution.
+        mask = mask | ~mask.any(dim=-1, keepdim=True)
+        logits = distribution.distribution.logits.masked_fill(~mask, -1e9)
+        return distribution.proba_distribution(action_logits=logits)
 
 
 class SafeAlgorithmAdapter(ABC):
     """Abstract base class for safe RL algorithm adapters."""
 
-    def __init__(self, env: gym.Env, **kwargs):
+    _action_bounds: Optional[tuple] = None
+
+    def __init__(self, env: gym.Env, n_envs: int = 1, **kwargs):
         """Initialize the algorithm adapter.
 
         Args:
             env: Gymnasium environment
+            n_envs: Number of environment copies stepped together during
+                training; copies are made with ``gym.make(env.spec)``
             **kwargs: Algorithm-specific parameters
         """
+        if n_envs < 1:
+            raise ValueError(f"n_envs must be at least 1, got {n_envs}")
         self.env = env
+        self.n_envs = n_envs
+        # Resolve the action-space kind once instead of on every step
+        space = env.action_space
+        self._is_discrete = hasattr(space, "n")
+        self._is_continuous = hasattr(space, "low") and hasattr(space, "high")
         self.kwargs = kwargs
         self.model: Optional[BaseAlgorithm] = None
         self.algorithm_name = self._get_algorithm_name()
+        self._vec_env: Optional[DummyVecEnv] = None
+        # Shares the model's ``seed`` kwarg so safety fallbacks are reproducible
+        self._rng = np.random.default_rng(kwargs.get("seed"))
 
     @abstractmethod
     def _get_algorithm_name(self) -> str:
@@ -65,19 +132,50 @@ class SafeAlgorithmAdapter(ABC):
         """
         pass
 
+    def _scaled_action_bounds(self, scale: float) -> tuple:
+        """Return ``(low, high)`` of the action space scaled by ``scale``.
+
+        Computed once per action space rather than on every step.
+        """
+        space = self.env.action_space
+        cached = self._action_bounds
+        if cached is None or cached[0] is not space or cached[1] != scale:
+            cached = (space, scale, space.low * scale, space.high * scale)
+            self._action_bounds = cached
+        return cached[2], cached[3]
+
     def create_model(self) -> BaseAlgorithm:
         """Create and return the RL model."""
         self.model = self._create_model()
         return self.model
 
+    def _model_env(self):
+        """Return the environment the model is built on.
+
+        That is ``env`` itself, or a vector of safety-wrapped copies of it
+        when ``n_envs > 1``.
+        """
+        if self.n_envs == 1:
+            return self.env
+        if self._vec_env is None:
+            spec = self.env.spec
+            if spec is None:
+                raise ValueError("n_envs > 1 requires an env created by gym.make")
+            # In-process vectorization: the policy sees one batched
+            # observation per step, without subprocess pickling of the adapter.
+            self._vec_env = DummyVecEnv(
+                [lambda: SafeEnvWrapper(gym.make(spec), self)] * self.n_envs
+            )
+        return self._vec_env
+
     def train(self, total_timesteps: int, **kwargs) -> None:
         """Train the model with safety considerations."""
         if self.model is None:
             self.create_model()
 
-        # Create a safety wrapper for training
-        safe_env = SafeEnvWrapper(self.env, self)
-        self.model.set_env(safe_env)
+        if self.n_envs == 1:
+            # Create a safety wrapper for training
+            self.model.set_env(SafeEnvWrapper(self.env, self))
         self.model.learn(total_timesteps=total_timesteps, **kwargs)
 
     def predict(self, observation: np.ndarray, deterministic: bool = True) -> tuple:
@@ -99,27 +197,46 @@ class SafeAlgorithmAdapter(ABC):
 class PPOSafeAdapter(SafeAlgorithmAdapter):
     """Safe PPO algorithm adapter."""
 
+    _all_safe_mask: Optional[np.ndarray] = None
+
+    def __init__(self, env: gym.Env, n_envs: int = 1, **kwargs):
+        super().__init__(env, n_envs, **kwargs)
+        # The CartPole penalty reads four state components; decide once from
+        # the observation space rather than checking every state.
+        shape = getattr(getattr(env, "observation_space", None), "shape", None)
+        self._penalize_state = bool(shape) and shape[0] >= 4
+
     def _get_algorithm_name(self) -> str:
         return "ppo"
 
     def _create_model(self) -> BaseAlgorithm:
-        return PPO("MlpPolicy", self.env, verbose=0, **self.kwargs)
+        if not self._is_discrete:
+            return PPO("MlpPolicy", self._model_env(), verbose=0, **self.kwargs)
+        model = PPO(
+            MaskedActorCriticPolicy, self._model_env(), verbose=0, **self.kwargs
+        )
+        # Set on the instance rather than via policy_kwargs so saving the
+        # model does not try to pickle the adapter and its environment.
+        model.policy.action_mask_fn = self._action_masks
+        return model
 
     def _apply_safety_constraints(
         self, action: np.ndarray, state: np.ndarray
     ) -> np.ndarray:
         """Apply action masking for discrete actions."""
         # For discrete actions, mask unsafe actions
-        if hasattr(self.env.action_space, "n"):
+        if self._is_discrete:
             # Discrete action space
-            safe_actions = self._get_safe_actions(state)
-            if len(safe_actions) == 0:
-                # No safe actions, return the original action
-                return action
+            safe_mask = self._safe_action_mask(state)
 
-            # If current action is unsafe, choose a safe alternative
-            if action not in safe_actions:
-                action = np.random.choice(safe_actions)
+            # The masked policy never proposes an unsafe action; this still
+            # guards models used without the mask (e.g. after loading).
+            if not safe_mask[action]:
+                safe_actions = np.flatnonzero(safe_mask)
+                if safe_actions.size == 0:
+                    # No safe actions, return the original action
+                    return action
+                action = safe_actions[self._rng.integers(safe_actions.size)]
 
         return action
 
@@ -131,6 +248,31 @@ class PPOSafeAdapter(SafeAlgorithmAdapter):
         safety_penalty = self._calculate_safety_penalty(state)
         return reward - safety_penalty
 
+    def _action_masks(self, observations: np.ndarray) -> Optional[np.ndarray]:
+        """Stack safe-action masks for a batch of observations for the policy."""
+        if self._all_actions_safe():
+            return None  # every action is safe; skip masking entirely
+        return np.stack([self._safe_action_mask(obs) for obs in observations])
+
+    def _safe_action_mask(self, state: np.ndarray) -> np.ndarray:
+        """Boolean mask over the discrete actions marking those in _get_safe_actions."""
+        n = self.env.action_space.n
+        if self._all_actions_safe():
+            # Every action is safe: share one read-only mask across calls
+            if self._all_safe_mask is None or self._all_safe_mask.size != n:
+                mask = np.ones(n, dtype=bool)
+                mask.flags.writeable = False
+                self._all_safe_mask = mask
+            return self._all_safe_mask
+        mask = np.zeros(n, dtype=bool)
+        mask[np.asarray(self._get_safe_actions(state), dtype=np.intp)] = True
+        return mask
+
+    def _all_actions_safe(self) -> bool:
+        """True while _get_safe_actions is the default that allows every action."""
+        method = getattr(self._get_safe_actions, "__func__", None)
+        return method is PPOSafeAdapter._get_safe_actions
+
     def _get_safe_actions(self, state: np.ndarray) -> list:
         """Get list of safe actions for current state."""
         # This would be implemented based on the specific environment
@@ -143,8 +285,10 @@ class PPOSafeAdapter(SafeAlgorithmAdapter):
         penalty = 0.0
 
         # CartPole-specific safety penalty
-        if hasattr(self.env, "observation_space") and len(state) >= 4:
-            cart_pos, cart_vel, pole_ang, pole_vel = state[:4]
+        if self._penalize_state:
+            # Plain floats: NumPy scalar arithmetic (or ufuncs on a 4-vector)
+            # costs more per call than the comparisons themselves.
+            cart_pos, cart_vel, pole_ang, pole_vel = np.asarray(state[:4]).tolist()
 
             # Penalty for being close to position limits
             if abs(cart_pos) > 2.0:
@@ -164,20 +308,18 @@ class SACSafeAdapter(SafeAlgorithmAdapter):
         return "sac"
 
     def _create_model(self) -> BaseAlgorithm:
-        return SAC("MlpPolicy", self.env, verbose=0, **self.kwargs)
+        return SAC("MlpPolicy", self._model_env(), verbose=0, **self.kwargs)
 
     def _apply_safety_constraints(
         self, action: np.ndarray, state: np.ndarray
     ) -> np.ndarray:
         """Apply action clipping for continuous actions."""
         # For continuous actions, clip to safe bounds
-        if hasattr(self.env.action_space, "low") and hasattr(
-            self.env.action_space, "high"
-        ):
+        if self._is_continuous:
             # Continuous action space
-            safe_low = self.env.action_space.low * 0.8  # Conservative bounds
-            safe_high = self.env.action_space.high * 0.8
-            action = np.clip(action, safe_low, safe_high)
+            safe_low, safe_high = self._scaled_action_bounds(0.8)  # Conservative
+            # Same as np.clip for low <= high, with less per-call overhead
+            action = np.minimum(np.maximum(action, safe_low), safe_high)
 
         return action
 
@@ -186,7 +328,8 @@ class SACSafeAdapter(SafeAlgorithmAdapter):
     ) -> float:
         """Calculate safety-adjusted reward for SAC."""
         # Add safety penalty based on action magnitude and state
-        action_penalty = np.sum(np.square(action)) * 0.01  # Penalize large actions
+        # Penalize large actions; vdot is the sum of squares without a temporary
+        action_penalty = float(np.vdot(action, action)) * 0.01
         state_penalty = self._calculate_safety_penalty(state)
         return reward - action_penalty - state_penalty
 
@@ -196,8 +339,8 @@ class SACSafeAdapter(SafeAlgorithmAdapter):
 
         # Continuous control safety penalty
         if len(state) >= 4:
-            # Example: penalty for extreme values
-            for _, val in enumerate(state):
+            # Example: penalty for extreme values, summed over plain floats
+            for val in np.asarray(state).tolist():
                 if abs(val) > 0.8:
                     penalty += (abs(val) - 0.8) * 5.0
 
@@ -211,20 +354,17 @@ class DDPGSafeAdapter(SafeAlgorithmAdapter):
         return "ddpg"
 
     def _create_model(self) -> BaseAlgorithm:
-        return DDPG("MlpPolicy", self.env, verbose=0, **self.kwargs)
+        return DDPG("MlpPolicy", self._model_env(), verbose=0, **self.kwargs)
 
     def _apply_safety_constraints(
         self, action: np.ndarray, state: np.ndarray
     ) -> np.ndarray:
         """Apply action clipping and velocity limits for DDPG."""
         # For continuous actions, apply conservative clipping
-        if hasattr(self.env.action_space, "low") and hasattr(
-            self.env.action_space, "high"
-        ):
+        if self._is_continuous:
             # More conservative bounds for DDPG
-            safe_low = self.env.action_space.low * 0.7
-            safe_high = self.env.action_space.high * 0.7
-            action = np.clip(action, safe_low, safe_high)
+            safe_low, safe_high = self._scaled_action_bounds(0.7)
+            action = np.minimum(np.maximum(action, safe_low), safe_high)
 
         return action
 
@@ -233,7 +373,7 @@ class DDPGSafeAdapter(SafeAlgorithmAdapter):
     ) -> float:
         """Calculate safety-adjusted reward for DDPG."""
         # Add safety penalty with higher weight for DDPG
-        action_penalty = np.sum(np.square(action)) * 0.02  # Higher penalty
+        action_penalty = float(np.vdot(action, action)) * 0.02  # Higher penalty
         state_penalty = self._calculate_safety_penalty(state)
         return reward - action_penalty - state_penalty
 
@@ -243,7 +383,7 @@ class DDPGSafeAdapter(SafeAlgorithmAdapter):
 
         # DDPG-specific safety penalty (more conservative)
         if len(state) >= 4:
-            for _, val in enumerate(state):
+            for val in np.asarray(state).tolist():
                 if abs(val) > 0.7:  # More conservative threshold
                     penalty += (abs(val) - 0.7) * 8.0  # Higher penalty
 
@@ -307,6 +447,7 @@ def create_safe_algorithm(
 
 # Export main classes
 __all__ = [
+    "MaskedActorCriticPolicy",
     "SafeAlgorithmAdapter",
     "PPOSafeAdapter",
     "SACSafeAdapter",
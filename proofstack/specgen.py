@@ -1,97 +1,130 @@
 """Lean4 specification generation for SafeRL ProofStack."""
 
+import io
+import time
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Optional, TextIO
 
 from .errors import ValidationError
 
+# Same guard as the compliance mapper's: an mtime this recent may still be shared
+# by a same-size rewrite that the (mtime_ns, size) stamp cannot tell apart.
+_RACY_WINDOW_NS = 2_000_000_000
 
-class SpecGen:
-    """Generate Lean4 specifications from Python safety constraints."""
 
-    def __init__(self):
-        """Initialize the specification generator."""
-        self.invariants: list[str] = []
-        self.guard: list[str] = []
-        self.lemmas: list[str] = []
-        self.lean_file_path: Optional[Path] = None
-        self.algorithm_name: str = "ppo"  # Default algorithm
-        self._proof_placeholder = "__PROOF_PLACEHOLDER__"
+def _is_racy(mtime_ns: int) -> bool:
+    """True if a file with this mtime could still change without its stat moving."""
+    return time.time_ns() - mtime_ns <= _RACY_WINDOW_NS
 
-    def set_algorithm(self, algorithm_name: str) -> None:
-        """Set the algorithm name for template generation.
+@lru_cache(maxsize=128)
+def _render_constraints(constraints: tuple[str, ...]) -> str:
+    """Render invariant/guard constraints as indented Lean lines.
 
-        Args:
-            algorithm_name: Name of the algorithm ('ppo', 'sac', 'ddpg')
-        """
-        self.algorithm_name = algorithm_name
+    Cached on the constraint tuple, so regenerating the same spec for several
+    algorithms converts each constraint only once.
+    """
+    return "\n".join(f"  {_convert_to_lean(c)}" for c in constraints)
 
-    def emit_lean(self, algorithm_name: Optional[str] = None) -> str:
-        """Generate Lean4 specification file.
 
-        Args:
-            algorithm_name: Optional algorithm name override
+@lru_cache(maxsize=128)
+def _render_lemmas(lemmas: tuple[str, ...], placeholder: str) -> str:
+    """Render lemma stubs, cached like ``_render_constraints``."""
+    return "\n".join(
+        f"""lemma {lemma} : ∀ σ σ', step σ σ' → {lemma}_property σ σ' := by
+  intro σ σ' h_step
+  exact {placeholder}"""
+        for lemma in lemmas
+    )
 
-        Returns:
-            Path to the generated Lean file
-        """
-        if algorithm_name:
-            self.algorithm_name = algorithm_name
 
-        # Create lean_output directory
-        lean_dir = Path("lean_output")
-        lean_dir.mkdir(exist_ok=True)
+def _convert_to_lean(constraint: str) -> str:
+    """Convert Python constraint notation to Lean syntax.
 
-        # Generate Lean content
-        lean_content = self._generate_lean_content()
+    The accepted notation (σ./a. fields, ≤ ≥ ∈ |, the CartPole variable
+    names) is already valid Lean, so constraints pass through unchanged.
+    """
+    return constraint
 
-        # Write to file
-        self.lean_file_path = lean_dir / "safety_proof.lean"
-        with open(self.lean_file_path, "w", encoding="utf-8") as f:
-            f.write(lean_content)
 
-        return str(self.lean_file_path)
+# Algorithm-specific safety theorems, keyed by algorithm name.
+_ALGORITHM_TEMPLATES: Mapping[str, str] = MappingProxyType(
+    {
+        "ppo": """-- PPO-specific safety theorem
+axiom ppo_policy : Policy
+theorem safe_ppo_policy : ∀ σ, invariant σ → safe_action (ppo_policy σ) := by
+  intro σ h_invariant
+  exact __PROOF_PLACEHOLDER__""",
+        "sac": """-- SAC-specific safety theorem
+axiom sac_policy : Policy
+theorem safe_sac_policy : ∀ σ, invariant σ → safe_action (sac_policy σ) := by
+  intro σ h_invariant
+  exact __PROOF_PLACEHOLDER__""",
+        "ddpg": """-- DDPG-specific safety theorem
+axiom ddpg_policy : Policy
+theorem safe_ddpg_policy : ∀ σ, invariant σ → safe_action (ddpg_policy σ) := by
+  intro σ h_invariant
+  exact __PROOF_PLACEHOLDER__""",
+    }
+)
 
-    def write_proof(self, proof: str) -> None:
-        """Write proof to the Lean file.
 
-        Args:
-            proof: Proof content to write
-        """
-        if not self.lean_file_path or not self.lean_file_path.exists():
-            raise ValueError("Lean file not generated. Call emit_lean() first.")
+_DEFAULT_INVARIANTS = """-- Default invariants
+def default_invariant (σ : State) : Prop :=
+  |σ.cart_position| ≤ 2.4 ∧
+  |σ.pole_angle| ≤ 0.2095"""
 
-        # Read current content
-        with open(self.lean_file_path, encoding="utf-8") as f:
-            content = f.read()
+_DEFAULT_GUARDS = """-- Default guards
+def default_guard (σ : State) (a : Action) : Prop :=
+  |σ.cart_position| ≤ 2.3 ∧
+  |σ.pole_angle| ≤ 0.2 ∧
+  |a.force| ≤ 10.0"""
 
-        # Replace explicit proof placeholder token with generated proof.
-        if self._proof_placeholder in content:
-            content = content.replace(self._proof_placeholder, proof)
-        else:
-            raise ValidationError("Proof placeholder token missing from generated Lean file.")
+_DEFAULT_LEMMAS = """-- Default lemmas
+lemma position_step_bound : ∀ σ, invariant σ → |σ.cart_position| ≤ 2.4 := by
+  intro σ h_inv
+  exact h_inv.left
 
-        # Write back
-        with open(self.lean_file_path, "w", encoding="utf-8") as f:
-            f.write(content)
+lemma angle_step_preserved : ∀ σ, invariant σ → |σ.pole_angle| ≤ 0.2095 := by
+  intro σ h_inv
+  exact h_inv.right"""
+
+
+def _render_invariants(invariants: tuple[str, ...]) -> str:
+    """Render Lean invariants, falling back to the CartPole defaults."""
+    return _render_constraints(invariants) if invariants else _DEFAULT_INVARIANTS
+
+
+def _render_guards(guard: tuple[str, ...]) -> str:
+    """Render Lean guards, falling back to the CartPole defaults."""
+    return _render_constraints(guard) if guard else _DEFAULT_GUARDS
 
-    def _generate_lean_content(self) -> str:
-        """Generate the complete Lean4 specification content."""
 
-        # Algorithm-specific template
-        algorithm_template = self._get_algorithm_template()
+def _render_lemma_section(lemmas: tuple[str, ...], placeholder: str) -> str:
+    """Render Lean lemmas, falling back to the CartPole defaults."""
+    return _render_lemmas(lemmas, placeholder) if lemmas else _DEFAULT_LEMMAS
 
-        # Generate invariants
-        invariants_text = self._generate_invariants()
 
-        # Generate guards
-        guards_text = self._generate_guards()
+def _algorithm_template(algorithm_name: str) -> str:
+    """Get the algorithm-specific Lean theorem, defaulting to PPO."""
+    return _ALGORITHM_TEMPLATES.get(algorithm_name, _ALGORITHM_TEMPLATES["ppo"])
 
-        # Generate lemmas
-        lemmas_text = self._generate_lemmas()
 
-        # Complete Lean file
-        lean_content = f"""-- SafeRL ProofStack: {self.algorithm_name.upper()} Safety Specification
+def _write_lean(
+    stream: TextIO,
+    algorithm_name: str,
+    invariants: tuple[str, ...],
+    guard: tuple[str, ...],
+    lemmas: tuple[str, ...],
+    placeholder: str,
+) -> None:
+    """Write a complete Lean4 specification to ``stream`` section by section."""
+    algo_upper = algorithm_name.upper()
+    write = stream.write
+
+    write(f"""-- SafeRL ProofStack: {algo_upper} Safety Specification
 -- Generated automatically from Python safety constraints
 
 import Mathlib.Data.Real.Basic
@@ -112,16 +145,15 @@ structure Action where
 def Policy := State → Action
 
 -- Safety invariants (must always hold)
-{invariants_text}
-
--- Guard conditions (checked before actions)
-{guards_text}
-
--- Safety lemmas for proof generation
-{lemmas_text}
-
--- Main safety theorem for {self.algorithm_name.upper()}
-{algorithm_template}
+""")
+    write(_render_invariants(invariants))
+    write("\n\n-- Guard conditions (checked before actions)\n")
+    write(_render_guards(guard))
+    write("\n\n-- Safety lemmas for proof generation\n")
+    write(_render_lemma_section(lemmas, placeholder))
+    write(f"\n\n-- Main safety theorem for {algo_upper}\n")
+    write(_algorithm_template(algorithm_name))
+    write(f"""
 
 -- Helper definitions
 def safe_action (a : Action) : Prop :=
@@ -132,108 +164,142 @@ def invariant (σ : State) : Prop :=
   |σ.pole_angle| ≤ 0.2095
 
 -- Proof placeholder
-theorem safety_proof : ∀ σ, invariant σ → safe_action (safe_{self.algorithm_name}_policy σ) := by
+theorem safety_proof : ∀ σ, invariant σ → safe_action (safe_{algorithm_name}_policy σ) := by
   by
-    exact {self._proof_placeholder}
-"""
+    exact {placeholder}
+""")
 
-        return lean_content
 
-    def _get_algorithm_template(self) -> str:
-        """Get algorithm-specific Lean template."""
-        templates = {
-            "ppo": """-- PPO-specific safety theorem
-axiom ppo_policy : Policy
-theorem safe_ppo_policy : ∀ σ, invariant σ → safe_action (ppo_policy σ) := by
-  intro σ h_invariant
-  exact __PROOF_PLACEHOLDER__""",
-            "sac": """-- SAC-specific safety theorem
-axiom sac_policy : Policy
-theorem safe_sac_policy : ∀ σ, invariant σ → safe_action (sac_policy σ) := by
-  intro σ h_invariant
-  exact __PROOF_PLACEHOLDER__""",
-            "ddpg": """-- DDPG-specific safety theorem
-axiom ddpg_policy : Policy
-theorem safe_ddpg_policy : ∀ σ, invariant σ → safe_action (ddpg_policy σ) := by
-  intro σ h_invariant
-  exact __PROOF_PLACEHOLDER__""",
-        }
+@lru_cache(maxsize=128)
+def _render_lean(
+    algorithm_name: str,
+    invariants: tuple[str, ...],
+    guard: tuple[str, ...],
+    lemmas: tuple[str, ...],
+    placeholder: str,
+) -> str:
+    """Render a complete Lean4 specification.
 
-        return templates.get(self.algorithm_name, templates["ppo"])
+    Pure in its arguments, so the rendered text is cached on the spec tuple
+    and regenerating an unchanged spec is a dictionary lookup.
+    """
+    buffer = io.StringIO()
+    _write_lean(buffer, algorithm_name, invariants, guard, lemmas, placeholder)
+    return buffer.getvalue()
 
-    def _generate_invariants(self) -> str:
-        """Generate Lean invariants from Python constraints."""
-        if not self.invariants:
-            return """-- Default invariants
-def default_invariant (σ : State) : Prop :=
-  |σ.cart_position| ≤ 2.4 ∧
-  |σ.pole_angle| ≤ 0.2095"""
 
-        invariant_lines = []
-        for inv in self.invariants:
-            # Convert Python notation to Lean
-            lean_inv = self._convert_to_lean(inv)
-            invariant_lines.append(f"  {lean_inv}")
+class SpecGen:
+    """Generate Lean4 specifications from Python safety constraints."""
 
-        return "\n".join(invariant_lines)
+    def __init__(self, output_dir="lean_output"):
+        """Initialize the specification generator.
 
-    def _generate_guards(self) -> str:
-        """Generate Lean guards from Python constraints."""
-        if not self.guard:
-            return """-- Default guards
-def default_guard (σ : State) (a : Action) : Prop :=
-  |σ.cart_position| ≤ 2.3 ∧
-  |σ.pole_angle| ≤ 0.2 ∧
-  |a.force| ≤ 10.0"""
+        Args:
+            output_dir: Directory emit_lean() writes safety_proof.lean into
+        """
+        self.output_dir = Path(output_dir)
+        self.invariants: list[str] = []
+        self.guard: list[str] = []
+        self.lemmas: list[str] = []
+        self.lean_file_path: Optional[Path] = None
+        self.algorithm_name: str = "ppo"  # Default algorithm
+        self._proof_placeholder = "__PROOF_PLACEHOLDER__"
+        # Last content written to lean_file_path and the (mtime_ns, size) it
+        # left, so write_proof can skip re-reading a file nobody else touched.
+        self._lean_content: Optional[str] = None
+        self._lean_stat: Optional[tuple[int, int]] = None
 
-        guard_lines = []
-        for guard in self.guard:
-            # Convert Python notation to Lean
-            lean_guard = self._convert_to_lean(guard)
-            guard_lines.append(f"  {lean_guard}")
+    def set_algorithm(self, algorithm_name: str) -> None:
+        """Set the algorithm name for template generation.
 
-        return "\n".join(guard_lines)
+        Args:
+            algorithm_name: Name of the algorithm ('ppo', 'sac', 'ddpg')
+        """
+        self.algorithm_name = algorithm_name
 
-    def _generate_lemmas(self) -> str:
-        """Generate Lean lemmas from Python constraints."""
-        if not self.lemmas:
-            return """-- Default lemmas
-lemma position_step_bound : ∀ σ, invariant σ → |σ.cart_position| ≤ 2.4 := by
-  intro σ h_inv
-  exact h_inv.left
+    def emit_lean(self, algorithm_name: Optional[str] = None) -> str:
+        """Generate Lean4 specification file.
 
-lemma angle_step_preserved : ∀ σ, invariant σ → |σ.pole_angle| ≤ 0.2095 := by
-  intro σ h_inv
-  exact h_inv.right"""
+        Args:
+            algorithm_name: Optional algorithm name override
 
-        lemma_lines = []
-        for lemma in self.lemmas:
-            lemma_lines.append(
-                f"""lemma {lemma} : ∀ σ σ', step σ σ' → {lemma}_property σ σ' := by
-  intro σ σ' h_step
-  exact {self._proof_placeholder}"""
-            )
+        Returns:
+            Path to the generated Lean file
+        """
+        if algorithm_name:
+            self.algorithm_name = algorithm_name
 
-        return "\n".join(lemma_lines)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.lean_file_path = self.output_dir / "safety_proof.lean"
+        self._write_lean_file(self._generate_lean_content())
 
-    def _convert_to_lean(self, constraint: str) -> str:
-        """Convert Python constraint notation to Lean syntax."""
-        # Replace common patterns
-        lean_constraint = constraint
+        return str(self.lean_file_path)
 
-        # Replace sigma notation
-        lean_constraint = lean_constraint.replace("σ.", "σ.")
-        lean_constraint = lean_constraint.replace("a.", "a.")
+    def write_proof(self, proof: str) -> None:
+        """Write proof to the Lean file.
 
-        # Replace mathematical symbols
-        lean_constraint = lean_constraint.replace("≤", "≤")
-        lean_constraint = lean_constraint.replace("≥", "≥")
-        lean_constraint = lean_constraint.replace("∈", "∈")
-        lean_constraint = lean_constraint.replace("|", "|")
+        Args:
+            proof: Proof content to write
+        """
+        if not self.lean_file_path or not self.lean_file_path.exists():
+            raise ValueError("Lean file not generated. Call emit_lean() first.")
+        st = self.lean_file_path.stat()
+
+        # Reuse the content emitted last unless the file changed underneath us;
+        # a stat inside the racy window is not trusted and forces a re-read
+        if self._lean_stat == (st.st_mtime_ns, st.st_size) and not _is_racy(
+            st.st_mtime_ns
+        ):
+            content = self._lean_content
+        else:
+            content = self.lean_file_path.read_text(encoding="utf-8")
 
-        # Replace variable names
-        lean_constraint = lean_constraint.replace("cart_position", "cart_position")
-        lean_constraint = lean_constraint.replace("pole_angle", "pole_angle")
-        lean_constraint = lean_constraint.replace("force", "force")
+        # Replace explicit proof placeholder token with generated proof.
+        if self._proof_placeholder in content:
+            content = content.replace(self._proof_placeholder, proof)
+        else:
+            raise ValidationError("Proof placeholder token missing from generated Lean file.")
 
-        return lean_constraint
+        # Write back
+        self._write_lean_file(content)
+
+    def _write_lean_file(self, content: str) -> None:
+        with open(self.lean_file_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        st = self.lean_file_path.stat()
+        self._lean_content = content
+        self._lean_stat = (st.st_mtime_ns, st.st_size)
+
+    def _spec_key(self) -> tuple:
+        """Hashable (algorithm, invariants, guard, lemmas, placeholder) key."""
+        return (
+            self.algorithm_name,
+            tuple(self.invariants),
+            tuple(self.guard),
+            tuple(self.lemmas),
+            self._proof_placeholder,
+        )
+
+    def _generate_lean_content(self) -> str:
+        """Generate the complete Lean4 specification content."""
+        return _render_lean(*self._spec_key())
+
+    def _get_algorithm_template(self) -> str:
+        """Get algorithm-specific Lean template."""
+        return _algorithm_template(self.algorithm_name)
+
+    def _generate_invariants(self) -> str:
+        """Generate Lean invariants from Python constraints."""
+        return _render_invariants(tuple(self.invariants))
+
+    def _generate_guards(self) -> str:
+        """Generate Lean guards from Python constraints."""
+        return _render_guards(tuple(self.guard))
+
+    def _generate_lemmas(self) -> str:
+        """Generate Lean lemmas from Python constraints."""
+        return _render_lemma_section(tuple(self.lemmas), self._proof_placeholder)
+
+    def _convert_to_lean(self, constraint: str) -> str:
+        """Convert Python constraint notation to Lean syntax."""
+        return _convert_to_lean(constraint)
@@ -4,25 +4,78 @@ Comprehensive test runner for SafeRL ProofStack
 Runs all tests, static analysis, and coverage checks as specified in H-0.
 """
 
+import shlex
 import subprocess
 import sys
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
-def run_command(cmd, description):
-    """Run a command and handle errors."""
-    print(f"🔍 {description}...")
+def _execute(cmd):
+    """Run a command, returning the error output on failure (else None).
+
+    The command is split into argv directly rather than via ``shell=True``,
+    which would spawn an extra ``/bin/sh`` per check just to tokenize it.
+    """
     try:
-        result = subprocess.run(
-            cmd, shell=True, check=True, capture_output=True, text=True
-        )
+        subprocess.run(shlex.split(cmd), check=True, capture_output=True, text=True)
+        return None
+    except subprocess.CalledProcessError as e:
+        return e.stderr
+    except FileNotFoundError as e:
+        return str(e)
+
+
+def _report(description, error):
+    if error is None:
         print(f"✅ {description} passed")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed")
-        print(f"Error: {e.stderr}")
-        return False
+    print(f"❌ {description} failed")
+    print(f"Error: {error}")
+    return False
+
+
+def run_command(cmd, description):
+    """Run a command and handle errors."""
+    print(f"🔍 {description}...")
+    return _report(description, _execute(cmd))
+
+
+def run_commands_concurrently(commands):
+    """Run independent ``(cmd, description)`` checks at once; report in order."""
+    for _, description in commands:
+        print(f"🔍 {description}...")
+    with ThreadPoolExecutor(max_workers=len(commands)) as pool:
+        errors = list(pool.map(_execute, [cmd for cmd, _ in commands]))
+    results = [
+        _report(description, error)
+        for (_, description), error in zip(commands, errors)
+    ]
+    return all(results)
+
+
+def run_cli_smoke_test(output_dir):
+    """Drive ``proofstack train`` for every algorithm through the poetry env.
+
+    The runs are independent (each writes its own model file), so they go
+    side by side like the other checks.
+    """
+    return run_commands_concurrently(
+        [
+            (
+                f"poetry run proofstack train --algo {algo} --env {env} "
+                f"--timesteps 10 --output {shlex.quote(output_dir)}",
+                f"CLI train ({algo})",
+            )
+            for algo, env in [
+                ("ppo", "CartPole-v1"),
+                ("sac", "Pendulum-v1"),
+                ("ddpg", "Pendulum-v1"),
+            ]
+        ]
+    )
 
 
 def main():
@@ -40,64 +93,56 @@ def main():
     print("\n📋 Step 1: Static Analysis")
     print("-" * 40)
 
-    if not run_command(
-        "poetry run ruff check proofstack/ tests/ examples/", "Ruff linting"
+    # The three linters are independent, so run them side by side
+    if not run_commands_concurrently(
+        [
+            ("poetry run ruff check proofstack/ tests/ examples/", "Ruff linting"),
+            ("poetry run mypy proofstack/", "MyPy type checking"),
+            (
+                "poetry run black --check --diff proofstack/ tests/ examples/",
+                "Black formatting check",
+            ),
+        ]
     ):
         all_passed = False
 
-    if not run_command("poetry run mypy proofstack/", "MyPy type checking"):
-        all_passed = False
-
-    if not run_command(
-        "poetry run black --check --diff proofstack/ tests/ examples/",
-        "Black formatting check",
-    ):
-        all_passed = False
-
-    # 2. Unit Tests with Coverage
-    print("\n🧪 Step 2: Unit Tests with Coverage")
+    # 2. Unit and Property-based Tests with Coverage
+    print("\n🧪 Step 2: Unit + Property-based Tests with Coverage")
     print("-" * 40)
 
+    # One pytest process covers both: the property-based tests live in tests/
+    # alongside the unit tests, so a second run would only repeat them.
     if not run_command(
-        "poetry run pytest --cov=proofstack --cov-report=term-missing --cov-fail-under=100",
+        "poetry run pytest tests/ -v --cov=proofstack --cov-report=term-missing "
+        "--cov-fail-under=100",
         "Pytest with coverage",
     ):
         all_passed = False
 
-    # 3. Property-based Tests
-    print("\n🔬 Step 3: Property-based Tests")
-    print("-" * 40)
-
-    if not run_command("poetry run pytest tests/ -v", "Property-based tests"):
-        all_passed = False
-
-    # 4. Lean Proof Checking
-    print("\n📐 Step 4: Lean Proof Checking")
+    # 3. Lean Proof Checking and Docker Build
+    print("\n📐 Step 3: Lean Proof Checking + 🐳 Docker Build")
     print("-" * 40)
 
+    # Independent builds; .lake is dockerignored so lake output never races
+    # into the Docker build context
+    builds = [
+        ("docker build -f docker/ci.Dockerfile -t saferl:test .", "Docker build")
+    ]
     if Path("lean_output").exists():
-        if not run_command("lake build", "Lean proof checking"):
-            all_passed = False
+        builds.insert(0, ("lake build", "Lean proof checking"))
     else:
         print("ℹ️  No Lean output directory found, skipping Lean check")
 
-    # 5. End-to-End Integration Test
-    print("\n🔄 Step 5: End-to-End Integration Test")
-    print("-" * 40)
-
-    if not run_command(
-        "poetry run python demo_complete_workflow.py", "End-to-end workflow"
-    ):
+    if not run_commands_concurrently(builds):
         all_passed = False
 
-    # 6. Docker Build Test
-    print("\n🐳 Step 6: Docker Build Test")
+    # 4. End-to-End Integration Test
+    print("\n🔄 Step 4: End-to-End Integration Test")
     print("-" * 40)
 
-    if not run_command(
-        "docker build -f docker/ci.Dockerfile -t saferl:test .", "Docker build"
-    ):
-        all_passed = False
+    with tempfile.TemporaryDirectory() as output_dir:
+        if not run_cli_smoke_test(output_dir):
+            all_passed = False
 
     # Summary
     print("\n" + "=" * 60)
@@ -1,7 +1,16 @@
 """Pytest and Hypothesis configuration for stable CI across platforms."""
 
+import pytest
 from hypothesis import settings
 
 # Property-based tests touch disk and coverage; default 200ms deadline flakes on Windows/CI.
 settings.register_profile("proofstack", deadline=None)
 settings.load_profile("proofstack")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_compliance_cache(tmp_path, monkeypatch):
+    """Keep cached compliance mappings out of the repository's cache dir."""
+    monkeypatch.setattr(
+        "proofstack.attestation._COMPLIANCE_CACHE_DIR", tmp_path / "compliance_cache"
+    )
@@ -0,0 +1,87 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+import torch as th
+
+from proofstack.rl.algorithms import (
+    MaskedActorCriticPolicy,
+    PPOSafeAdapter,
+    SafeEnvWrapper,
+)
+
+
+class LeftOnlyPPOAdapter(PPOSafeAdapter):
+    """Adapter that only allows action 0 while the cart is right of centre."""
+
+    def _get_safe_actions(self, state):
+        return [0] if state[0] > 0.0 else [0, 1]
+
+
+class TestPPOSafeAdapter:
+    """Test suite for PPOSafeAdapter action masking and vectorized training."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.env = gym.make("CartPole-v1")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        self.env.close()
+
+    def test_ppo_uses_masked_policy_for_discrete_actions(self):
+        """Test: discrete PPO models get the masked policy and mask function."""
+        model = PPOSafeAdapter(self.env, n_steps=64).create_model()
+
+        assert isinstance(model.policy, MaskedActorCriticPolicy)
+        # With every action safe there is nothing to mask
+        assert model.policy.action_mask_fn(np.zeros((2, 4), dtype=np.float32)) is None
+
+    def test_masked_actions_are_never_sampled(self):
+        """Test: masked logits exclude unsafe actions from sampling and evaluation."""
+        model = LeftOnlyPPOAdapter(self.env, n_steps=64).create_model()
+        obs = th.tensor([[0.5, 0.0, 0.0, 0.0], [-0.5, 0.0, 0.0, 0.0]] * 50)
+
+        with th.no_grad():
+            actions, _, _ = model.policy(obs)
+            _, log_prob, _ = model.policy.evaluate_actions(obs, th.ones(100))
+
+        assert (actions[0::2] == 0).all()
+        assert (log_prob[0::2] < -1e6).all()
+        assert (log_prob[1::2] > -1e6).all()
+
+    def test_training_steps_several_wrapped_envs(self):
+        """Test: n_envs builds the model on a vector of safety-wrapped copies."""
+        adapter = PPOSafeAdapter(self.env, n_envs=3, n_steps=16, batch_size=48)
+        adapter.train(total_timesteps=48)
+
+        assert adapter.model.n_envs == 3
+        assert adapter.model.num_timesteps == 48
+        assert all(isinstance(e, SafeEnvWrapper) for e in adapter.model.env.envs)
+
+    def test_safe_actions_are_action_indices(self):
+        """Test: _get_safe_actions lists indices and the mask is derived from them."""
+        adapter = LeftOnlyPPOAdapter(self.env)
+        state = np.array([0.5, 0.0, 0.0, 0.0])
+
+        assert PPOSafeAdapter(self.env)._get_safe_actions(state) == [0, 1]
+        assert adapter._safe_action_mask(state).tolist() == [True, False]
+        assert adapter._apply_safety_constraints(1, state) == 0
+
+    def test_n_envs_must_be_positive(self):
+        """Test edge case: a non-positive environment count is rejected."""
+        with pytest.raises(ValueError):
+            PPOSafeAdapter(self.env, n_envs=0)
+
+    def test_safety_fallback_is_reproducible_with_seed(self):
+        """Test: replacement actions for unsafe choices follow the seed kwarg."""
+        env = gym.make("Acrobot-v1")  # three discrete actions
+
+        def fallbacks(seed):
+            adapter = PPOSafeAdapter(env, seed=seed)
+            adapter._get_safe_actions = lambda state: [1, 2]
+            state = np.zeros(6)
+            return [int(adapter._apply_safety_constraints(0, state)) for _ in range(20)]
+
+        assert fallbacks(7) == fallbacks(7)
+        assert set(fallbacks(7)) <= {1, 2}
+        env.close()
@@ -1,13 +1,23 @@
+import hashlib
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import pytest
 from fastapi.testclient import TestClient
 
-from proofstack.api import app
+from proofstack import api
+from proofstack.api import app, list_artifacts
+from proofstack.contracts import load_safety_spec
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def _bundle_root(tmp_path, monkeypatch):
+    """Create bundle work dirs under the test's temp dir."""
+    monkeypatch.setattr("proofstack.api.BUNDLE_ROOT", tmp_path / "bundles")
+
+
 def test_bundle_rejects_unknown_algorithm(tmp_path: Path):
     spec_file = tmp_path / "spec.yaml"
     spec_file.write_text(
@@ -38,9 +48,167 @@ def test_bundle_and_download_artifact(tmp_path: Path):
     with patch("proofstack.api.check_fireworks_key", return_value="key"), patch(
         "proofstack.api.ProofPipeline.run", return_value=mock_bundle
     ):
-        response = client.post("/bundle", json={"spec_file": str(spec_file)})
+        response = client.post(
+            "/bundle",
+            json={"spec_file": str(spec_file)},
+        )
         assert response.status_code == 200
         bundle_id = response.json()["bundle_id"]
 
         dl = client.get(f"/bundle/{bundle_id}", params={"artifact": "guard.c"})
         assert dl.status_code == 200
+
+
+def test_list_artifacts_reports_regular_files_only(tmp_path: Path):
+    (tmp_path / "guard.c").write_text("int x;", encoding="utf-8")
+    (tmp_path / "compliance.json").write_text("{}", encoding="utf-8")
+    (tmp_path / ".hidden").write_text("", encoding="utf-8")
+    (tmp_path / "nested").mkdir()
+
+    assert list_artifacts(str(tmp_path)) == {
+        "guard.c": {"size": 6, "type": ".c"},
+        "compliance.json": {"size": 2, "type": ".json"},
+    }
+    assert list_artifacts(str(tmp_path / "missing")) == {}
+
+
+def test_bundle_batch_loads_each_spec_once(tmp_path: Path):
+    spec_file = tmp_path / "spec.yaml"
+    spec_file.write_text(
+        "environment: cartpole\ninvariants: ['x']\nguard: ['y']\nlemmas: []\n",
+        encoding="utf-8",
+    )
+    mock_bundle = Mock(path=str(tmp_path / "bundle"))
+    Path(mock_bundle.path).mkdir()
+
+    items = [
+        {"spec_file": str(spec_file), "algorithm": "ppo"},
+        {"spec_file": str(spec_file), "algorithm": "sac"},
+        {"spec_file": str(spec_file), "algorithm": "invalid"},
+        {"spec_file": str(tmp_path / "missing.yaml")},
+    ]
+    with patch("proofstack.api.check_fireworks_key", return_value="key"), patch(
+        "proofstack.api.load_safety_spec", wraps=load_safety_spec
+    ) as mock_load, patch(
+        "proofstack.api.ProofPipeline.run", return_value=mock_bundle
+    ) as mock_run:
+        response = client.post("/bundle/batch", json={"items": items})
+
+    assert response.status_code == 200
+    statuses = [result["status"] for result in response.json()["results"]]
+    assert statuses == ["success", "success", "error", "error"]
+    assert [c.kwargs["algo"] for c in mock_run.call_args_list] == ["ppo", "sac"]
+    # One load for the shared spec, one for the missing file
+    assert mock_load.call_count == 2
+
+
+def test_bundle_job_runs_in_background_and_reports_status(tmp_path: Path):
+    spec_file = tmp_path / "spec.yaml"
+    spec_file.write_text(
+        "environment: cartpole\ninvariants: ['x']\nguard: ['y']\nlemmas: []\n",
+        encoding="utf-8",
+    )
+    mock_bundle = Mock(path=str(tmp_path / "bundle"))
+    Path(mock_bundle.path).mkdir()
+
+    with patch("proofstack.api.check_fireworks_key", return_value="key"), patch(
+        "proofstack.api.ProofPipeline.run", return_value=mock_bundle
+    ):
+        response = client.post(
+            "/bundle/jobs",
+            json={"spec_file": str(spec_file)},
+        )
+        assert response.status_code == 202
+        status_url = response.json()["status_url"]
+
+        # TestClient runs background tasks before returning the response
+        status = client.get(status_url).json()
+        assert status["status"] == "completed"
+        assert status["result"]["bundle_path"] == mock_bundle.path
+
+    assert client.get("/bundle/status/unknown").status_code == 404
+
+
+def test_bundle_batch_items_get_their_own_artifacts(tmp_path: Path):
+    spec_file = tmp_path / "spec.yaml"
+    spec_file.write_text(
+        "environment: cartpole\ninvariants: ['x']\nguard: ['y']\nlemmas: []\n",
+        encoding="utf-8",
+    )
+    algorithms = ("ppo", "sac")
+    items = [
+        {"spec_file": str(spec_file), "algorithm": algo, "output_dir": "batch"}
+        for algo in algorithms
+    ]
+    with patch("proofstack.api.check_fireworks_key", return_value="key"), patch(
+        "proofstack.prover_api.ProverAPI.complete", return_value="simp [h_guard]"
+    ):
+        response = client.post("/bundle/batch", json={"items": items})
+
+    results = response.json()["results"]
+    bundle_paths = [Path(result["bundle_path"]) for result in results]
+    assert len(set(bundle_paths)) == len(algorithms)
+    for algo, bundle_path in zip(algorithms, bundle_paths):
+        lean = (bundle_path.parent / "lean_output" / "safety_proof.lean").read_bytes()
+        assert f"safe_{algo}_policy".encode() in lean
+        # The attested project hash covers this item's Lean file and no other
+        expected = hashlib.sha256(
+            b"lean_output/safety_proof.lean\0" + hashlib.sha256(lean).digest()
+        ).hexdigest()
+        assert (bundle_path / "lean_project.sha256").read_text() == expected
+
+
+def test_bundle_requests_get_their_own_work_dirs(tmp_path: Path):
+    spec_file = tmp_path / "spec.yaml"
+    spec_file.write_text(
+        "environment: cartpole\ninvariants: ['x']\nguard: ['y']\nlemmas: []\n",
+        encoding="utf-8",
+    )
+    request = {"spec_file": str(spec_file), "output_dir": "runs"}
+    with patch("proofstack.api.check_fireworks_key", return_value="key"), patch(
+        "proofstack.api.ProofPipeline.run", return_value=Mock(path=str(tmp_path))
+    ), patch(
+        "proofstack.api.ProofPipeline", wraps=api.ProofPipeline
+    ) as mock_pipeline:
+        assert client.post("/bundle", json=request).status_code == 200
+        assert client.post("/bundle", json=request).status_code == 200
+        assert client.post("/bundle/jobs", json=request).status_code == 202
+
+    work_dirs = [c.kwargs["work_dir"] for c in mock_pipeline.call_args_list]
+    assert len(set(work_dirs)) == 3
+    runs_dir = tmp_path / "bundles" / "runs"
+    assert all(work_dir.parent == runs_dir for work_dir in work_dirs)
+
+
+def test_bundle_jobs_evicts_oldest_finished_records():
+    jobs = {
+        "old-done": {"job_id": "old-done", "status": "completed"},
+        "running": {"job_id": "running", "status": "running"},
+        "new-done": {"job_id": "new-done", "status": "failed"},
+        "pending": {"job_id": "pending", "status": "pending"},
+    }
+    with patch.dict(api.BUNDLE_JOBS, jobs, clear=True), patch.object(
+        api, "MAX_BUNDLE_JOBS", 2
+    ):
+        api._evict_bundle_jobs()
+        assert list(api.BUNDLE_JOBS) == ["running", "pending"]
+
+
+@pytest.mark.parametrize("output_dir", ["/tmp/elsewhere", "../outside", "dist/../../x"])
+def test_bundle_rejects_output_dirs_outside_the_bundle_root(tmp_path, output_dir):
+    spec_file = tmp_path / "spec.yaml"
+    spec_file.write_text(
+        "environment: cartpole\ninvariants: ['x']\nguard: ['y']\nlemmas: []\n",
+        encoding="utf-8",
+    )
+    request = {"spec_file": str(spec_file), "output_dir": output_dir}
+    with patch("proofstack.api.check_fireworks_key", return_value="key"), patch(
+        "proofstack.api.ProofPipeline"
+    ) as mock_pipeline:
+        assert client.post("/bundle", json=request).status_code == 422
+        assert client.post("/bundle/jobs", json=request).status_code == 422
+        batch = client.post("/bundle/batch", json={"items": [request]}).json()
+
+    assert batch["results"][0]["status"] == "error"
+    mock_pipeline.assert_not_called()
+    assert not (tmp_path / "bundles").exists()
@@ -1,11 +1,22 @@
-import shutil
-import tempfile
+import hashlib
+import json
+import os
 from pathlib import Path
+from unittest.mock import patch
 
-from hypothesis import given
+import pytest
+from hypothesis import Phase, given, settings
 from hypothesis import strategies as st
 
-from proofstack.attestation import Attestation
+from proofstack.attestation import Attestation, _prune_compliance_cache
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+# Each example writes a full set of artifacts, so cap the example count and
+# skip shrinking on these disk-bound properties.
+_IO_BOUND = settings(
+    max_examples=25, phases=(Phase.explicit, Phase.reuse, Phase.generate)
+)
 
 
 class MockSafetySpec:
@@ -16,12 +27,14 @@ class MockSafetySpec:
 
 
 class MockGuardGen:
-    def __init__(self):
-        self.path = None
+    def __init__(self, work_dir):
+        # Emit into a namespaced subdir of the test's temp dir rather than a
+        # fresh mkdtemp per instance, so one teardown cleans everything up.
+        self.path = Path(work_dir) / "guard_src" / "guard.c"
 
     def emit_c(self, spec):
-        if self.path is None:
-            self.path = Path(tempfile.mkdtemp()) / "guard.c"
+        if not self.path.exists():
+            self.path.parent.mkdir(exist_ok=True)
             self.path.write_text("int main(void) { return 0; }", encoding="utf-8")
         return str(self.path)
 
@@ -29,15 +42,18 @@ class MockGuardGen:
 class TestAttestation:
     """Test suite for Attestation with property-based testing."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.attestation = Attestation(out_dir=self.temp_dir)
+    @pytest.fixture(autouse=True, scope="class")
+    @classmethod
+    def _attestation_root(cls, tmp_path_factory):
+        """One temporary root per class; pytest prunes old roots itself."""
+        cls.attestation_root = tmp_path_factory.mktemp("attestation")
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    def setup_method(self, method):
+        """Set up test fixtures in a per-test subdirectory of the shared root."""
+        self.temp_dir = str(self.attestation_root / method.__name__)
+        self.attestation = Attestation(out_dir=self.temp_dir)
 
+    @_IO_BOUND
     @given(spec_content=st.text(min_size=10, max_size=1000))
     def test_generate_html_report_creates_valid_html(self, spec_content):
         """Property: generate_html_report always creates valid HTML with spec content."""
@@ -51,22 +67,25 @@ class TestAttestation:
         assert html_path.exists()
         assert html_path.suffix == ".html"
 
+        content = html_path.read_bytes()
+        assert b"ProofStack Attestation" in content
+        assert b"Spec" in content
+
+    def test_generate_html_report_escapes_spec(self):
+        """Test: markup in the spec is escaped rather than injected."""
+        html_path = self.attestation.generate_html_report("<script>x & y</script>")
+
         content = html_path.read_text(encoding="utf-8")
-        assert "ProofStack Attestation" in content
-        assert "Spec" in content
+        assert "<script>" not in content
+        assert "&lt;script&gt;x &amp; y&lt;/script&gt;" in content
 
-    @given(
-        spec_hash=st.text(
-            min_size=10,
-            max_size=64,
-            alphabet=st.characters(whitelist_categories=("Nd",)),
-        )
-    )
-    def test_generate_hash_creates_valid_sha256(self, spec_hash):
-        """Property: generate_hash creates valid SHA256 hash."""
+    @_IO_BOUND
+    @given(lean_source=st.binary(max_size=1024))
+    def test_generate_hash_creates_valid_sha256(self, lean_source):
+        """Property: generate_hash writes the SHA256 root over the Lean file."""
         # Create a temporary Lean file for testing
         lean_file = Path(self.temp_dir) / "test.lean"
-        lean_file.write_text("test content", encoding="utf-8")
+        lean_file.write_bytes(lean_source)
 
         # Act
         hash_path = self.attestation.generate_hash(target_dir=self.temp_dir)
@@ -75,7 +94,63 @@ class TestAttestation:
         assert hash_path.exists()
         hash_content = hash_path.read_text(encoding="utf-8")
         assert len(hash_content.strip()) == 64  # SHA256 is 64 hex chars
-        assert all(c in "0123456789abcdef" for c in hash_content.lower())
+        assert set(hash_content.lower()) <= _HEX_DIGITS
+        expected = hashlib.sha256(
+            b"test.lean\0" + hashlib.sha256(lean_source).digest()
+        )
+        assert hash_content == expected.hexdigest()
+
+    def test_generate_hash_is_deterministic_and_content_sensitive(self):
+        """Test: root digest depends on file contents, not listing order."""
+        nested = Path(self.temp_dir) / "Proofs"
+        nested.mkdir()
+        (Path(self.temp_dir) / "a.lean").write_text("theorem a", encoding="utf-8")
+        (nested / "b.olean").write_bytes(b"\x00\x01")
+
+        first = self.attestation.generate_hash(self.temp_dir).read_text()
+        second = self.attestation.generate_hash(self.temp_dir).read_text()
+        (nested / "b.olean").write_bytes(b"\x00\x02")
+        changed = self.attestation.generate_hash(self.temp_dir).read_text()
+
+        assert first == second
+        assert first != changed
+
+    def test_generate_hash_root_covers_large_and_small_files(self):
+        """Test: mmap'd and buffered files both hash into the documented root."""
+        large = bytes(range(256)) * 8192  # 2 MiB, above the mmap threshold
+        (Path(self.temp_dir) / "big.olean").write_bytes(large)
+        (Path(self.temp_dir) / "small.lean").write_bytes(b"theorem t")
+
+        expected = hashlib.sha256()
+        for name, data in (("big.olean", large), ("small.lean", b"theorem t")):
+            expected.update(name.encode() + b"\0" + hashlib.sha256(data).digest())
+
+        hash_path = self.attestation.generate_hash(self.temp_dir)
+        assert hash_path.read_text() == expected.hexdigest()
+
+        manifest_path = Path(self.temp_dir) / "lean_project.sha256.json"
+        manifest = json.loads(manifest_path.read_text())
+        assert manifest == {
+            "hash_scheme": "sha256-path-digest-v1",
+            "sha256": expected.hexdigest(),
+        }
+
+    def test_compliance_mapper_rereads_recently_rewritten_artifact(self):
+        """Test: a same-size rewrite in the same mtime tick is not served stale."""
+        guard = Path(self.temp_dir) / "racy_guard.c"
+        guard.write_text("int a;", encoding="utf-8")
+        mapper = self.attestation.compliance_mapper
+        assert mapper._load_guard_content(str(guard)) == "int a;"
+
+        mtime_ns = guard.stat().st_mtime_ns
+        guard.write_text("int b;", encoding="utf-8")
+        os.utime(guard, ns=(mtime_ns, mtime_ns))
+        assert mapper._load_guard_content(str(guard)) == "int b;"
+
+    def test_attestations_share_one_compliance_mapper(self):
+        """Test: the read-only compliance mapper is built once and reused."""
+        other = Attestation(out_dir=str(Path(self.temp_dir) / "other_bundle"))
+        assert other.compliance_mapper is self.attestation.compliance_mapper
 
     def test_generate_sbom_creates_valid_json(self):
         """Test: generate_sbom creates valid JSON file."""
@@ -86,8 +161,94 @@ class TestAttestation:
         assert sbom_path.exists()
         assert sbom_path.suffix == ".json"
 
-        content = sbom_path.read_text(encoding="utf-8")
-        assert "SPDX-2.3" in content
+        assert b"SPDX-2.3" in sbom_path.read_bytes()
+
+    def test_generate_sbom_skips_subprocess_when_tool_missing(self):
+        """Test: no process is spawned when cyclonedx-bom is not installed."""
+        with patch("proofstack.attestation._CYCLONEDX_BOM", None), patch(
+            "proofstack.attestation.subprocess.run"
+        ) as mock_run:
+            sbom_path = self.attestation.generate_sbom()
+
+        mock_run.assert_not_called()
+        assert json.loads(sbom_path.read_text(encoding="utf-8"))["spdxVersion"] == (
+            "SPDX-2.3"
+        )
+
+    def test_compliance_mapping_is_reused_for_unchanged_inputs(self, monkeypatch):
+        """Test: remapping only happens when an input artifact changes."""
+        monkeypatch.chdir(self.temp_dir)
+        Path("lean_output").mkdir()
+        Path("lean_output/safety_proof.lean").write_text("theorem t", encoding="utf-8")
+        attestation = Attestation(out_dir="bundle")
+        attestation.generate_sbom()
+        guard = attestation.out_dir / "guard.c"
+        guard.write_text("int guard;", encoding="utf-8")
+        spec = MockSafetySpec(["inv1"], ["guard1"], [])
+        mapper = attestation.compliance_mapper
+
+        with patch.object(
+            mapper, "map_artifacts_to_controls", wraps=mapper.map_artifacts_to_controls
+        ) as spy:
+            path = attestation.generate_compliance_mapping(spec, None)
+            first = json.loads(path.read_bytes())
+            second = json.loads(
+                attestation.generate_compliance_mapping(spec, None).read_bytes()
+            )
+            assert spy.call_count == 1
+            # The reused mapping is identical apart from fresh timestamps
+            assert second["report_date"] >= first["report_date"]
+            stamps = {m["last_verified"] for m in second["control_mappings"]}
+            assert stamps == {second["report_date"]}
+            assert second["summary"]["last_updated"] == second["report_date"]
+            for report in (first, second):
+                del report["report_date"], report["summary"]["last_updated"]
+                for mapping in report["control_mappings"]:
+                    del mapping["last_verified"]
+            assert first == second
+
+            guard.write_text("int guard2;", encoding="utf-8")
+            attestation.generate_compliance_mapping(spec, None)
+            assert spy.call_count == 2
+
+            # A different mapper (new control tables or code) remaps too
+            with patch(
+                "proofstack.attestation._COMPLIANCE_MAPPER_DIGEST", b"upgraded"
+            ):
+                attestation.generate_compliance_mapping(spec, None)
+            assert spy.call_count == 3
+
+    def test_compliance_cache_keeps_a_bounded_number_of_entries(self, tmp_path):
+        """Test: the least recently used cached mappings are pruned."""
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        for i in range(5):
+            entry = cache_dir / f"{i}.json"
+            entry.write_bytes(b"{}")
+            os.utime(entry, ns=(i, i))
+
+        with patch("proofstack.attestation._COMPLIANCE_CACHE_MAX_ENTRIES", 2):
+            _prune_compliance_cache(cache_dir)
+
+        assert sorted(p.name for p in cache_dir.iterdir()) == ["3.json", "4.json"]
+
+    def test_compliance_report_uses_one_utc_timestamp(self, monkeypatch):
+        """Test: every control and the summary share the report timestamp."""
+        monkeypatch.chdir(self.temp_dir)
+        Path("lean_output").mkdir()
+        Path("lean_output/safety_proof.lean").write_text("theorem t", encoding="utf-8")
+        attestation = Attestation(out_dir="bundle")
+        attestation.generate_sbom()
+        (attestation.out_dir / "guard.c").write_text("int guard;", encoding="utf-8")
+        spec = MockSafetySpec(["inv1"], ["guard1"], [])
+
+        path = attestation.generate_compliance_mapping(spec, None)
+        report = json.loads(path.read_text(encoding="utf-8"))
+
+        stamps = {m["last_verified"] for m in report["control_mappings"]}
+        assert stamps == {report["report_date"]}
+        assert report["summary"]["last_updated"] == report["report_date"]
+        assert report["report_date"].endswith("+00:00")
 
     def test_generate_pdf_creates_file(self):
         """Test: generate_pdf creates a deterministic artifact file."""
@@ -102,6 +263,7 @@ class TestAttestation:
         assert pdf_path.exists()
         assert pdf_path.suffix == ".pdf"
 
+    @_IO_BOUND
     @given(
         invariant_count=st.integers(min_value=1, max_value=10),
         guard_count=st.integers(min_value=1, max_value=10),
@@ -112,7 +274,7 @@ class TestAttestation:
         invariants = [f"invariant_{i}" for i in range(invariant_count)]
         guards = [f"guard_{i}" for i in range(guard_count)]
         spec = MockSafetySpec(invariants, guards, ["lemma1"])
-        guardgen = MockGuardGen()
+        guardgen = MockGuardGen(self.temp_dir)
 
         # Act
         bundle = self.attestation.bundle(spec, guardgen)
@@ -122,29 +284,45 @@ class TestAttestation:
         assert hasattr(bundle, "path")
         assert Path(bundle.path).exists()
 
-        # Check that all expected files exist
-        bundle_dir = Path(bundle.path)
-        expected_files = [
+        # Check that all expected files exist, from a single directory listing
+        expected_files = {
             "attestation.html",
             "attestation.pdf",
             "sbom.spdx.json",
             "lean_project.sha256",
             "guard.c",
-        ]
-
-        for expected_file in expected_files:
-            assert (bundle_dir / expected_file).exists()
+        }
+        with os.scandir(bundle.path) as entries:
+            present = {entry.name for entry in entries}
+        assert expected_files <= present
 
     def test_bundle_with_empty_spec(self):
         """Test edge case: bundle with empty safety specification."""
         spec = MockSafetySpec([], [], [])
-        guardgen = MockGuardGen()
+        guardgen = MockGuardGen(self.temp_dir)
 
         bundle = self.attestation.bundle(spec, guardgen)
 
         assert bundle is not None
         assert hasattr(bundle, "path")
 
+    def test_bundle_copies_and_maps_a_given_sbom(self):
+        """Test: an SBOM produced elsewhere is bundled and used for compliance."""
+        spec = MockSafetySpec(["inv1"], ["guard1"], [])
+        spec.lean_file_path = Path(self.temp_dir) / "safety_proof.lean"
+        spec.lean_file_path.write_text("theorem t", encoding="utf-8")
+        sbom = Path(self.temp_dir) / "prebuilt" / "bom.json"
+        sbom.parent.mkdir(parents=True)
+        sbom.write_bytes(b'{"spdxVersion": "SPDX-2.3", "name": "prebuilt"}')
+
+        with patch.object(Attestation, "generate_sbom") as generate_sbom:
+            bundle = self.attestation.bundle(
+                spec, MockGuardGen(self.temp_dir), sbom_path=sbom
+            )
+
+        generate_sbom.assert_not_called()
+        assert (Path(bundle.path) / "sbom.spdx.json").read_bytes() == sbom.read_bytes()
+
     def test_bundle_with_complex_spec(self):
         """Test edge case: bundle with complex safety specification."""
         spec = MockSafetySpec(
@@ -156,13 +334,14 @@ class TestAttestation:
             ],
             lemmas=["position_step_bound", "angle_step_preserved"],
         )
-        guardgen = MockGuardGen()
+        guardgen = MockGuardGen(self.temp_dir)
 
         bundle = self.attestation.bundle(spec, guardgen)
 
         assert bundle is not None
         assert hasattr(bundle, "path")
 
+    @_IO_BOUND
     @given(
         invalid_chars=st.text(
             min_size=1,
@@ -177,7 +356,7 @@ class TestAttestation:
             guard=[f"guard_{invalid_chars}"],
             lemmas=[],
         )
-        guardgen = MockGuardGen()
+        guardgen = MockGuardGen(self.temp_dir)
 
         bundle = self.attestation.bundle(spec, guardgen)
 
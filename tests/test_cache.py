@@ -1,8 +1,8 @@
 import json
-import shutil
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
@@ -12,16 +12,18 @@ from proofstack.cache import ProofCache
 class TestProofCache:
     """Test suite for ProofCache with comprehensive mutation detection."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+    @pytest.fixture(autouse=True, scope="class")
+    @classmethod
+    def _cache_root(cls, tmp_path_factory):
+        """One temporary root per class; pytest prunes old roots itself."""
+        cls.cache_root = tmp_path_factory.mktemp("proof_cache")
+
+    def setup_method(self, method):
+        """Set up test fixtures in a per-test subdirectory of the shared root."""
+        self.temp_dir = str(self.cache_root / method.__name__)
         self.cache_dir = Path(self.temp_dir) / ".proofstack_cache"
         self.cache = ProofCache(self.cache_dir)
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     def test_cache_initialization(self):
         """Test: Cache initializes correctly with custom directory."""
         assert self.cache.cache_dir == self.cache_dir
@@ -37,16 +39,28 @@ class TestProofCache:
         key2 = self.cache._cache_key(spec_sha256, algo, mathlib_commit)
 
         assert key1 == key2
-        assert key1 == "abc123_ppo_def456"
+        assert key1 == ("abc123", "ppo", "def456")
+
+    def test_cache_keys_do_not_collide_across_components(self):
+        """Test: underscores inside components cannot alias another key."""
+        self.cache.set("abc_ppo", "def456", "main", {"tactic": "simp"})
+        self.cache.set("abc", "ppo_def456", "main", {"tactic": "linarith"})
+
+        reloaded = ProofCache(self.cache_dir)
+        assert reloaded.get("abc_ppo", "def456", "main") == {"tactic": "simp"}
+        assert reloaded.get("abc", "ppo_def456", "main") == {"tactic": "linarith"}
 
     def test_cache_path_generation(self):
         """Test: Cache path generation creates stable paths under the cache dir."""
-        key = "test_key"
+        key = ("abc123", "ppo", "def456")
         p1 = self.cache._cache_path(key)
         p2 = self.cache._cache_path(key)
         assert p1 == p2
-        assert p1.parent == self.cache_dir
+        assert p1.parent.parent.parent == self.cache_dir
         assert p1.suffix == ".json"
+        # Two-level shard directories are taken from the digest prefix
+        assert p1.parent.parent.name == p1.stem[:2]
+        assert p1.parent.name == p1.stem[2:4]
 
     def test_cache_set_and_get(self):
         """Test: Basic cache set and get functionality."""
@@ -75,13 +89,44 @@ class TestProofCache:
         self.cache.set("xyz789", "sac", "ghi012", {"test2": "data2"})
 
         # Verify files exist
-        assert len(list(self.cache.cache_dir.glob("*.json"))) == 2
+        assert len(list(self.cache.cache_dir.rglob("*.json"))) == 2
 
         # Clear cache
         self.cache.clear()
 
         # Verify files are gone
-        assert len(list(self.cache.cache_dir.glob("*.json"))) == 0
+        assert len(list(self.cache.cache_dir.rglob("*.json"))) == 0
+        # Empty shard directories are pruned too
+        assert list(self.cache.cache_dir.iterdir()) == []
+
+    def test_cache_clear_without_fwalk(self, monkeypatch):
+        """Test: clear does not depend on os.fwalk (absent on Windows)."""
+        monkeypatch.delattr("os.fwalk")
+        self.cache.set("abc123", "ppo", "def456", {"test": "data"})
+        (self.cache.cache_dir / "notes.txt").write_text("keep", encoding="utf-8")
+
+        self.cache.clear()
+
+        assert [p.name for p in self.cache.cache_dir.iterdir()] == ["notes.txt"]
+
+    def test_cache_clear_keeps_other_cache_subtrees(self):
+        """Test: clear removes sharded and legacy flat entries, not other data."""
+        self.cache.set("abc123", "ppo", "def456", {"test": "data"})
+        compliance = self.cache.cache_dir / "compliance" / f"{'a' * 64}.json"
+        compliance.parent.mkdir()
+        compliance.write_bytes(b"{}")
+        # A flat entry left by a version that predates the sharded layout
+        (self.cache.cache_dir / f"{'b' * 64}.json").write_bytes(b"{}")
+        (self.cache.cache_dir / "notes.json").write_bytes(b"{}")
+
+        self.cache.clear()
+
+        assert self.cache.get("abc123", "ppo", "def456") is None
+        assert sorted(p.name for p in self.cache.cache_dir.iterdir()) == [
+            "compliance",
+            "notes.json",
+        ]
+        assert compliance.read_bytes() == b"{}"
 
     def test_compute_spec_sha256(self):
         """Test: SHA256 computation is deterministic."""
@@ -97,6 +142,22 @@ class TestProofCache:
         assert hash1 != hash3
         assert len(hash1) == 64  # SHA256 hex length
 
+    def test_compute_spec_sha256_accepts_bytes(self):
+        """Test: Pre-encoded UTF-8 specs hash identically to their str form."""
+        spec = "|σ.cart_position| ≤ 2.4"
+        assert ProofCache.compute_spec_sha256(
+            spec.encode("utf-8")
+        ) == ProofCache.compute_spec_sha256(spec)
+
+    def test_compute_spec_sha256_memoizes_repeated_specs(self):
+        """Test: Repeated specs are served from the hash memo, not rehashed."""
+        spec = "memoized specification"
+        first = ProofCache.compute_spec_sha256(spec)
+        hits_before = ProofCache.compute_spec_sha256.cache_info().hits
+
+        assert ProofCache.compute_spec_sha256(spec) == first
+        assert ProofCache.compute_spec_sha256.cache_info().hits == hits_before + 1
+
     @given(
         spec=st.text(min_size=1, max_size=100),
         algo=st.text(min_size=1, max_size=20),
@@ -230,6 +291,14 @@ class TestProofCache:
 
         assert result == unicode_proof
 
+        # Symbols are stored as raw UTF-8 rather than \u escapes
+        cache_file = self.cache._cache_path(
+            self.cache._cache_key(spec_sha256, algo, mathlib_commit)
+        )
+        raw = cache_file.read_text(encoding="utf-8")
+        assert "α" in raw
+        assert "\\u03b1" not in raw
+
     def test_cache_malformed_file_handling(self):
         """Test: Cache handles malformed JSON files gracefully."""
         spec_sha256 = "abc123"
@@ -240,8 +309,8 @@ class TestProofCache:
         cache_file = self.cache._cache_path(
             self.cache._cache_key(spec_sha256, algo, mathlib_commit)
         )
-        with open(cache_file, "w", encoding="utf-8") as f:
-            f.write('{"malformed": json}')
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(b'{"malformed": json}')
 
         # Should return None for malformed files
         result = self.cache.get(spec_sha256, algo, mathlib_commit)
@@ -308,19 +377,86 @@ class TestProofCache:
         assert result == large_proof
         assert len(result["lemmas"]) == 1000
 
-    def test_cache_concurrent_access_simulation(self):
-        """Test: Cache handles simulated concurrent access patterns."""
-        spec_sha256 = "abc123"
-        algo = "ppo"
-        mathlib_commit = "def456"
-
-        # Simulate multiple rapid set/get operations
-        for i in range(10):
-            proof = {"tactic": "simp", "iteration": i}
-            self.cache.set(spec_sha256, algo, mathlib_commit, proof)
-            result = self.cache.get(spec_sha256, algo, mathlib_commit)
-            assert result == proof
-
-        # Final result should be the last set
-        final_result = self.cache.get(spec_sha256, algo, mathlib_commit)
-        assert final_result["iteration"] == 9
+    def test_cache_concurrent_access(self):
+        """Test: Threads racing on shared keys see whole entries, never errors."""
+        cache = ProofCache(self.cache_dir, memory_size=2)
+        specs = [f"spec{i % 4}" for i in range(64)]
+
+        def write_then_read(i):
+            cache.set(specs[i], "ppo", "def456", {"iteration": i})
+            return cache.get(specs[i], "ppo", "def456")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(write_then_read, range(64)))
+
+        # Each read sees some complete write for its key
+        for i, result in enumerate(results):
+            assert specs[result["iteration"]] == specs[i]
+        assert list(self.cache_dir.rglob("*.tmp")) == []
+        reloaded = ProofCache(self.cache_dir)
+        assert reloaded.get("spec0", "ppo", "def456")["iteration"] % 4 == 0
+
+    def test_cache_set_async_and_flush(self):
+        """Test: Queued writes are readable immediately and persisted on flush."""
+        proofs = {f"spec{i}": {"tactic": "simp", "iteration": i} for i in range(5)}
+        for spec_sha256, proof in proofs.items():
+            self.cache.set_async(spec_sha256, "ppo", "def456", proof)
+
+        # Pending writes are visible before flush
+        assert self.cache.get("spec0", "ppo", "def456") == proofs["spec0"]
+
+        self.cache.flush()
+        assert len(list(self.cache.cache_dir.rglob("*.json"))) == 5
+
+        # A fresh cache over the same directory sees the persisted entries
+        reloaded = ProofCache(self.cache_dir)
+        for spec_sha256, proof in proofs.items():
+            assert reloaded.get(spec_sha256, "ppo", "def456") == proof
+
+    def test_cache_overwrite_leaves_no_temp_files(self):
+        """Test: Entries are replaced atomically without stray temp files."""
+        self.cache.set("spec1", "ppo", "def456", {"tactic": "simp"})
+        self.cache.set("spec1", "ppo", "def456", {"tactic": "linarith"})
+
+        assert list(self.cache.cache_dir.rglob("*.tmp")) == []
+        reloaded = ProofCache(self.cache_dir)
+        assert reloaded.get("spec1", "ppo", "def456") == {"tactic": "linarith"}
+
+    def test_cache_memory_layer_serves_recent_entries(self):
+        """Test: Recent entries are served from memory and evicted LRU-first."""
+        cache = ProofCache(self.cache_dir, memory_size=1)
+        cache.set("spec1", "ppo", "def456", {"tactic": "simp"})
+        path1 = cache._cache_path(cache._cache_key("spec1", "ppo", "def456"))
+
+        # Removing the file does not affect an in-memory hit
+        path1.unlink()
+        assert cache.get("spec1", "ppo", "def456") == {"tactic": "simp"}
+
+        # A second entry evicts the first, which then falls through to disk
+        cache.set("spec2", "ppo", "def456", {"tactic": "linarith"})
+        assert cache.get("spec1", "ppo", "def456") is None
+        assert cache.get("spec2", "ppo", "def456") == {"tactic": "linarith"}
+
+    def test_cache_hits_are_isolated_from_caller_mutation(self):
+        """Test: mutating a stored or returned sketch does not change later hits."""
+        sketch = {"tactic": "simp"}
+        self.cache.set("spec1", "ppo", "def456", sketch)
+        sketch["tactic"] = "mutated"
+        self.cache.get("spec1", "ppo", "def456")["tactic"] = "mutated"
+
+        self.cache.set_async("spec2", "ppo", "def456", {"tactic": "linarith"})
+        self.cache.get("spec2", "ppo", "def456")["tactic"] = "mutated"
+
+        assert self.cache.get("spec1", "ppo", "def456") == {"tactic": "simp"}
+        assert self.cache.get("spec2", "ppo", "def456") == {"tactic": "linarith"}
+        self.cache.flush()
+
+    def test_cache_memory_hit_skips_path_resolution(self, monkeypatch):
+        """Test: Hot hits are answered from the key alone, before any path work."""
+        self.cache.set("spec1", "ppo", "def456", {"tactic": "simp"})
+
+        def fail(key):
+            raise AssertionError("memory hit should not resolve a cache path")
+
+        monkeypatch.setattr(self.cache, "_cache_path", fail)
+        assert self.cache.get("spec1", "ppo", "def456") == {"tactic": "simp"}
@@ -1,11 +1,16 @@
-import shutil
-import tempfile
+from pathlib import Path
 
-from hypothesis import given
+from hypothesis import given, settings
 from hypothesis import strategies as st
 
 from proofstack.guard_codegen import GuardGen
 
+# Each example renders and writes guard.c, so cap the example count.
+_IO_BOUND = settings(max_examples=25)
+
+# Shared by the invariants and guards arguments below.
+_SPEC_LIST = st.lists(st.text(min_size=1, max_size=50), min_size=1, max_size=5)
+
 
 class MockSafetySpec:
     def __init__(self, invariants, guard, lemmas):
@@ -26,15 +31,11 @@ class TestGuardGen:
     def setup_method(self):
         """Set up test fixtures."""
         self.guardgen = GuardGen()
-        self.temp_dir = tempfile.mkdtemp()
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
 
+    @_IO_BOUND
     @given(
-        invariants=st.lists(st.text(min_size=1, max_size=50), min_size=1, max_size=5),
-        guards=st.lists(st.text(min_size=1, max_size=50), min_size=1, max_size=5),
+        invariants=_SPEC_LIST,
+        guards=_SPEC_LIST,
         lemmas=st.lists(st.text(min_size=1, max_size=30), min_size=0, max_size=3),
     )
     def test_emit_c_creates_valid_c_file(self, invariants, guards, lemmas):
@@ -63,6 +64,7 @@ class TestGuardGen:
         # Implementation depends on the actual GuardGen.emit_c implementation
         assert hasattr(self.guardgen, "emit_c")
 
+    @_IO_BOUND
     @given(invariant_count=st.integers(min_value=1, max_value=10))
     def test_guard_code_scales_with_invariants(self, invariant_count):
         """Property: Guard code size scales appropriately with number of invariants."""
@@ -100,6 +102,7 @@ class TestGuardGen:
 
         assert result is not None
 
+    @_IO_BOUND
     @given(
         invalid_chars=st.text(
             min_size=1,
@@ -118,3 +121,18 @@ class TestGuardGen:
         result = self.guardgen.emit_c(spec)
 
         assert result is not None
+
+    def test_emit_c_leaves_unchanged_guard_untouched(self, tmp_path):
+        """Test: re-emitting an identical spec does not rewrite guard.c."""
+        self.guardgen.output_dir = tmp_path / "guard_output"
+        spec = MockSafetySpec(["inv1"], ["guard1"], [])
+
+        c_file = Path(self.guardgen.emit_c(spec))
+        first_stat = c_file.stat()
+        self.guardgen.emit_c(spec)
+        assert c_file.stat().st_mtime_ns == first_stat.st_mtime_ns
+        assert c_file.stat().st_ino == first_stat.st_ino
+
+        self.guardgen.emit_c(MockSafetySpec(["inv2"], ["guard1"], []))
+        assert c_file.stat().st_ino != first_stat.st_ino
+        assert list(c_file.parent.iterdir()) == [c_file]
@@ -0,0 +1,74 @@
+import gymnasium as gym
+import pytest
+
+from proofstack import SpecGen
+from proofstack.rl.algorithms import (
+    DDPGSafeAdapter,
+    PPOSafeAdapter,
+    SACSafeAdapter,
+    create_safe_algorithm,
+)
+
+ALGORITHMS = ("ppo", "sac", "ddpg")
+
+
+@pytest.fixture(scope="module")
+def cartpole_env():
+    """One CartPole environment shared by every test in the module."""
+    env = gym.make("CartPole-v1")
+    yield env
+    env.close()
+
+
+@pytest.fixture(scope="module")
+def cartpole_spec():
+    """CartPole SpecGen built once; tests only switch its algorithm."""
+    spec = SpecGen()
+    spec.invariants = ["|σ.cart_position| ≤ 2.4", "|σ.pole_angle| ≤ 0.2095"]
+    spec.guard = ["|σ.cart_position| ≤ 2.3", "|σ.pole_angle| ≤ 0.2"]
+    spec.lemmas = ["position_step_bound", "angle_step_preserved"]
+    return spec
+
+
+@pytest.mark.parametrize(
+    "adapter_cls, algo",
+    [(PPOSafeAdapter, "ppo"), (SACSafeAdapter, "sac"), (DDPGSafeAdapter, "ddpg")],
+)
+def test_algorithm_adapters(cartpole_env, adapter_cls, algo):
+    """Test: each adapter reports its Lean template name."""
+    assert adapter_cls(cartpole_env).algorithm_name == algo
+
+
+@pytest.mark.parametrize("algo", ALGORITHMS)
+def test_algorithm_factory(cartpole_env, algo):
+    """Test: the factory builds the adapter for each supported algorithm."""
+    assert create_safe_algorithm(algo, cartpole_env).algorithm_name == algo
+
+
+def test_algorithm_factory_rejects_unknown_algorithm(cartpole_env):
+    """Test edge case: an unsupported algorithm name is rejected."""
+    with pytest.raises(ValueError):
+        create_safe_algorithm("invalid", cartpole_env)
+
+
+@pytest.mark.parametrize("algo", ALGORITHMS)
+def test_specgen_algorithm_support(cartpole_spec, algo):
+    """Test: SpecGen emits the algorithm-specific theorem for each algorithm."""
+    cartpole_spec.set_algorithm(algo)
+    lean_content = cartpole_spec._generate_lean_content()
+
+    assert f"safe_{algo}_policy" in lean_content
+    assert f"{algo.upper()} Safety Specification" in lean_content
+
+
+def test_safety_constraints(cartpole_env):
+    """Test: safe actions pass through and safe states are not penalized."""
+    test_state = [0.0, 0.0, 0.0, 0.0]
+    ppo_adapter = PPOSafeAdapter(cartpole_env)
+
+    assert ppo_adapter._apply_safety_constraints(0, test_state) == 0
+    assert ppo_adapter._calculate_safety_reward(1.0, test_state, 0) == 1.0
+
+    # CartPole has no continuous bounds, so SAC leaves the action untouched
+    sac_adapter = SACSafeAdapter(cartpole_env)
+    assert sac_adapter._apply_safety_constraints([0.5, 0.3], test_state) == [0.5, 0.3]
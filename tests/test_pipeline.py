@@ -1,14 +1,20 @@
-import shutil
-import tempfile
+import asyncio
+import os
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import DEFAULT, Mock, patch
 
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
+from proofstack.attestation import Attestation
+from proofstack.cache import ProofCache
+from proofstack.guard_codegen import GuardGen
 from proofstack.pipeline import ProofPipeline
 
+# Shared by the invariants and guards arguments below.
+_SPEC_LIST = st.lists(st.text(min_size=1, max_size=50), min_size=1, max_size=5)
+
 
 class MockSafetySpec:
     def __init__(self, invariants, guard, lemmas):
@@ -28,17 +34,12 @@ class TestProofPipeline:
 
     def setup_method(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
         self.env = MockEnv()
         self.api_key = "test_api_key_12345"
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     @given(
-        invariants=st.lists(st.text(min_size=1, max_size=50), min_size=1, max_size=5),
-        guards=st.lists(st.text(min_size=1, max_size=50), min_size=1, max_size=5),
+        invariants=_SPEC_LIST,
+        guards=_SPEC_LIST,
         lemmas=st.lists(st.text(min_size=1, max_size=30), min_size=0, max_size=3),
     )
     def test_pipeline_creates_bundle(self, invariants, guards, lemmas):
@@ -58,42 +59,47 @@ class TestProofPipeline:
             assert hasattr(bundle, "path")
             assert Path(bundle.path).exists()
 
-    def test_pipeline_with_valid_spec(self):
-        """Test: Pipeline with valid safety specification."""
-        spec = MockSafetySpec(
-            invariants=["|σ.cart_position| ≤ 2.4", "|σ.pole_angle| ≤ 0.2095"],
-            guard=[
-                "|σ.cart_position| ≤ 2.3",
-                "|σ.pole_angle| ≤ 0.2",
-                "|a.force| ≤ 10.0",
-            ],
-            lemmas=["position_step_bound", "angle_step_preserved"],
-        )
-
+    @pytest.mark.parametrize(
+        "spec, prover_kw",
+        [
+            pytest.param(
+                MockSafetySpec(
+                    invariants=[
+                        "|σ.cart_position| ≤ 2.4",
+                        "|σ.pole_angle| ≤ 0.2095",
+                    ],
+                    guard=[
+                        "|σ.cart_position| ≤ 2.3",
+                        "|σ.pole_angle| ≤ 0.2",
+                        "|a.force| ≤ 10.0",
+                    ],
+                    lemmas=["position_step_bound", "angle_step_preserved"],
+                ),
+                {},
+                id="valid_spec",
+            ),
+            pytest.param(MockSafetySpec([], [], []), {}, id="empty_spec"),
+            pytest.param(
+                MockSafetySpec(["inv1"], ["guard1"], []),
+                {"prover": "fireworks/custom-model"},
+                id="custom_prover_model",
+            ),
+        ],
+    )
+    def test_pipeline_bundle_shape(self, spec, prover_kw):
+        """Test: valid, empty and custom-model pipelines each produce a bundle."""
         with patch("proofstack.prover_api.ProverAPI.complete") as mock_complete:
             mock_complete.return_value = "simp [h_guard]"
 
-            pipeline = ProofPipeline(self.env, spec, self.api_key)
+            pipeline = ProofPipeline(self.env, spec, self.api_key, **prover_kw)
             bundle = pipeline.run(reuse_cache=False)
 
             assert bundle is not None
             assert hasattr(bundle, "path")
-
-            # Verify the prover was called
             mock_complete.assert_called_once()
-
-    def test_pipeline_with_empty_spec(self):
-        """Test edge case: Pipeline with empty safety specification."""
-        spec = MockSafetySpec([], [], [])
-
-        with patch("proofstack.prover_api.ProverAPI.complete") as mock_complete:
-            mock_complete.return_value = "simp [h_guard]"
-
-            pipeline = ProofPipeline(self.env, spec, self.api_key)
-            bundle = pipeline.run(reuse_cache=False)
-
-            assert bundle is not None
-            assert hasattr(bundle, "path")
+            assert pipeline.prover.model == prover_kw.get(
+                "prover", "fireworks/deepseek-prover-v2"
+            )
 
     def test_pipeline_with_api_error_raises(self):
         """Test: Pipeline fails fast when prover API fails."""
@@ -134,34 +140,18 @@ class TestProofPipeline:
             pipeline = ProofPipeline(self.env, spec, self.api_key)
             bundle = pipeline.run(reuse_cache=False)
 
-            # Check that attestation bundle was created
-            bundle_dir = Path(bundle.path)
-            assert bundle_dir.exists()
-
-            expected_files = [
+            expected_files = {
                 "attestation.html",
                 "attestation.pdf",
                 "sbom.spdx.json",
                 "lean_project.sha256",
                 "guard.c",
-            ]
-
-            for expected_file in expected_files:
-                assert (bundle_dir / expected_file).exists()
-
-    def test_pipeline_with_custom_prover_model(self):
-        """Test: Pipeline with custom prover model."""
-        spec = MockSafetySpec(["inv1"], ["guard1"], [])
-        custom_model = "fireworks/custom-model"
+            }
 
-        with patch("proofstack.prover_api.ProverAPI.complete") as mock_complete:
-            mock_complete.return_value = "simp [h_guard]"
-
-            pipeline = ProofPipeline(self.env, spec, self.api_key, prover=custom_model)
-            bundle = pipeline.run(reuse_cache=False)
-
-            assert bundle is not None
-            assert hasattr(bundle, "path")
+            # One directory listing instead of a stat per artifact
+            with os.scandir(bundle.path) as entries:
+                present = {entry.name for entry in entries}
+            assert expected_files <= present
 
     @given(
         api_key=st.text(
@@ -196,33 +186,117 @@ class TestProofPipeline:
         assert pipeline.attestation is not None
         assert pipeline.guardgen is not None
 
-    def test_pipeline_run_sequence(self):
+    def test_pipeline_run_sequence(self, tmp_path):
         """Test: Pipeline runs the correct sequence of operations."""
         spec = MockSafetySpec(["inv1"], ["guard1"], [])
+        lean_file = tmp_path / "safety_proof.lean"
+        lean_file.write_text("theorem t : True := by sorry", encoding="utf-8")
+
+        with patch.multiple(
+            "proofstack.specgen.SpecGen", emit_lean=DEFAULT, write_proof=DEFAULT
+        ) as specgen, patch(
+            "proofstack.prover_api.ProverAPI.complete", return_value="simp [h_guard]"
+        ) as mock_complete, patch(
+            "proofstack.guard_codegen.GuardGen.emit_c"
+        ) as mock_emit_c, patch(
+            "proofstack.attestation.Attestation.bundle",
+            return_value=Mock(path="attestation_bundle"),
+        ) as mock_bundle:
+            specgen["emit_lean"].return_value = str(lean_file)
+
+            pipeline = ProofPipeline(self.env, spec, self.api_key)
+            pipeline.run(reuse_cache=False)
+
+        # Verify the sequence of operations
+        specgen["emit_lean"].assert_called_once()
+        mock_complete.assert_called_once_with("theorem t : True := by sorry")
+        specgen["write_proof"].assert_called_once()
+        mock_emit_c.assert_called_once()
+        mock_bundle.assert_called_once()
+
+    def test_pipeline_cache_is_keyed_by_spec_content(self, tmp_path):
+        """Test: Cached proofs are reused per spec, never across specs."""
+        cache = ProofCache(tmp_path / "cache")
+
+        with patch("proofstack.prover_api.ProverAPI.complete") as mock_complete:
+            mock_complete.return_value = "simp [h_guard]"
+
+            for invariants in (["inv1"], ["inv2"], ["inv1"]):
+                pipeline = ProofPipeline(
+                    self.env, MockSafetySpec(invariants, ["guard1"], []), self.api_key
+                )
+                pipeline.cache = cache
+                pipeline.run(reuse_cache=True)
+
+            # The second spec misses; repeating the first one hits the cache
+            assert mock_complete.call_count == 2
+
+    def test_pipeline_renders_the_guard_once(self):
+        """Test: the guard emitted alongside the prover call is the one bundled."""
+        spec = MockSafetySpec(["inv1"], ["guard1"], [])
+
+        with patch(
+            "proofstack.prover_api.ProverAPI.complete", return_value="simp [h_guard]"
+        ), patch(
+            "proofstack.guard_codegen.GuardGen.emit_c",
+            autospec=True,
+            side_effect=GuardGen.emit_c,
+        ) as mock_emit_c:
+            bundle = ProofPipeline(self.env, spec, self.api_key).run(reuse_cache=False)
+
+        mock_emit_c.assert_called_once()
+        assert (Path(bundle.path) / "guard.c").exists()
+
+    def test_pipeline_sends_lean_source_to_the_prover(self):
+        """Test: each algorithm's Lean source reaches the prover and its cache."""
+        pipeline = ProofPipeline(
+            self.env, MockSafetySpec(["inv1"], ["guard1"], []), self.api_key
+        )
+
+        with patch(
+            "proofstack.prover_api.ProverAPI._request_completion",
+            return_value="simp [h_guard]",
+        ) as mock_request:
+            for algo in ("ppo", "sac", "ppo"):
+                pipeline.run(reuse_cache=False, algo=algo)
+
+        # The same output path for both algorithms must not share a completion
+        sent = [c.args[0] for c in mock_request.call_args_list]
+        assert len(sent) == 2
+        assert "safe_ppo_policy" in sent[0] and "safe_sac_policy" in sent[1]
+
+    def test_pipeline_run_is_callable_from_a_running_event_loop(self):
+        """Test: the sync run() works where a loop is already running (Jupyter)."""
+        spec = MockSafetySpec(["inv1"], ["guard1"], [])
+
+        async def run_inside_loop():
+            return ProofPipeline(self.env, spec, self.api_key).run(reuse_cache=False)
 
         with patch("proofstack.prover_api.ProverAPI.complete") as mock_complete:
             mock_complete.return_value = "simp [h_guard]"
+            bundle = asyncio.run(run_inside_loop())
+
+        assert Path(bundle.path).exists()
+
+    def test_pipeline_generates_sbom_once_alongside_prover(self, tmp_path):
+        """Test: The SBOM is built during the prover call and reused by the bundle."""
+        spec = MockSafetySpec(["inv1"], ["guard1"], [])
+
+        def write_sbom(attestation):
+            sbom_path = attestation.out_dir / "sbom.spdx.json"
+            sbom_path.write_bytes(b'{"spdxVersion": "SPDX-2.3"}')
+            return sbom_path
+
+        with patch("proofstack.prover_api.ProverAPI.complete") as mock_complete, patch(
+            "proofstack.attestation.Attestation.generate_sbom",
+            autospec=True,
+            side_effect=write_sbom,
+        ) as mock_sbom:
+            mock_complete.return_value = "simp [h_guard]"
+
+            pipeline = ProofPipeline(self.env, spec, self.api_key)
+            pipeline.attestation = Attestation(out_dir=tmp_path / "bundle")
+            bundle = pipeline.run(reuse_cache=False)
 
-            with patch("proofstack.specgen.SpecGen.emit_lean") as mock_emit_lean:
-                mock_emit_lean.return_value = "lean_output/safety_proof.lean"
-
-                with patch(
-                    "proofstack.specgen.SpecGen.write_proof"
-                ) as mock_write_proof:
-                    with patch(
-                        "proofstack.guard_codegen.GuardGen.emit_c"
-                    ) as mock_emit_c:
-                        with patch(
-                            "proofstack.attestation.Attestation.bundle"
-                        ) as mock_bundle:
-                            mock_bundle.return_value = Mock(path="attestation_bundle")
-
-                            pipeline = ProofPipeline(self.env, spec, self.api_key)
-                            pipeline.run(reuse_cache=False)
-
-                            # Verify the sequence of operations
-                            mock_emit_lean.assert_called_once()
-                            mock_complete.assert_called_once()
-                            mock_write_proof.assert_called_once()
-                            mock_emit_c.assert_called_once()
-                            mock_bundle.assert_called_once()
+        mock_sbom.assert_called_once()
+        assert bundle.path == str(tmp_path / "bundle")
@@ -1,6 +1,8 @@
+import asyncio
 from unittest.mock import Mock, patch
 
 import httpx
+import orjson
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
@@ -20,7 +22,7 @@ class TestProverAPI:
     @given(lean_code=st.text(min_size=10, max_size=1000))
     def test_complete_returns_string(self, lean_code):
         """Property: complete always returns a string response."""
-        with patch("httpx.post") as mock_post:
+        with patch("httpx.Client.post") as mock_post:
             # Mock successful response
             mock_response = Mock()
             mock_response.raise_for_status.return_value = None
@@ -41,7 +43,7 @@ class TestProverAPI:
           sorry
         """
 
-        with patch("httpx.post") as mock_post:
+        with patch("httpx.Client.post") as mock_post:
             mock_response = Mock()
             mock_response.raise_for_status.return_value = None
             mock_response.json.return_value = {
@@ -55,17 +57,17 @@ class TestProverAPI:
 
             # Verify the API call was made correctly
             mock_post.assert_called_once()
-            call_args = mock_post.call_args
-            assert call_args[1]["json"]["model"] == "fireworks/deepseek-prover-v2"
-            assert call_args[1]["json"]["temperature"] == 0.0
-            assert call_args[1]["json"]["stream"] is False
-            assert call_args[1]["json"]["max_tokens"] == 2048
+            payload = orjson.loads(mock_post.call_args[1]["content"])
+            assert payload["model"] == "fireworks/deepseek-prover-v2"
+            assert payload["temperature"] == 0.0
+            assert payload["stream"] is False
+            assert payload["max_tokens"] == 2048
 
     def test_complete_with_api_error_raises(self):
         """Test: complete raises typed error when API fails."""
         lean_code = "test lean code"
 
-        with patch("httpx.post") as mock_post:
+        with patch("httpx.Client.post") as mock_post:
             # Mock API error
             mock_post.side_effect = httpx.HTTPStatusError(
                 "404 Not Found", request=Mock(), response=Mock()
@@ -78,7 +80,7 @@ class TestProverAPI:
         """Test: complete raises typed error when network fails."""
         lean_code = "test lean code"
 
-        with patch("httpx.post") as mock_post:
+        with patch("httpx.Client.post") as mock_post:
             # Mock network error
             mock_post.side_effect = httpx.ConnectError("Network error")
             with pytest.raises(ProverNetworkError):
@@ -113,7 +115,7 @@ class TestProverAPI:
         """Property: complete handles Lean code of various lengths."""
         lean_code = "a" * lean_code_length
 
-        with patch("httpx.post") as mock_post:
+        with patch("httpx.Client.post") as mock_post:
             mock_response = Mock()
             mock_response.raise_for_status.return_value = None
             mock_response.json.return_value = {
@@ -134,7 +136,7 @@ class TestProverAPI:
           sorry
         """
 
-        with patch("httpx.post") as mock_post:
+        with patch("httpx.Client.post") as mock_post:
             mock_response = Mock()
             mock_response.raise_for_status.return_value = None
             mock_response.json.return_value = {
@@ -145,8 +147,7 @@ class TestProverAPI:
             self.prover.complete(lean_code)
 
             # Verify the Lean code was sent in the request
-            call_args = mock_post.call_args
-            messages = call_args[1]["json"]["messages"]
+            messages = orjson.loads(mock_post.call_args[1]["content"])["messages"]
             assert len(messages) == 2
             assert messages[0]["role"] == "system"
             assert messages[1]["role"] == "user"
@@ -154,7 +155,7 @@ class TestProverAPI:
 
     def test_complete_with_empty_lean_code(self):
         """Test edge case: complete with empty Lean code."""
-        with patch("httpx.post") as mock_post:
+        with patch("httpx.Client.post") as mock_post:
             mock_response = Mock()
             mock_response.raise_for_status.return_value = None
             mock_response.json.return_value = {
@@ -170,7 +171,7 @@ class TestProverAPI:
         """Test: complete handles special characters in Lean code."""
         lean_code = "theorem test : ∀ (x : ℝ), x² ≥ 0 := by sorry"
 
-        with patch("httpx.post") as mock_post:
+        with patch("httpx.Client.post") as mock_post:
             mock_response = Mock()
             mock_response.raise_for_status.return_value = None
             mock_response.json.return_value = {
@@ -181,3 +182,77 @@ class TestProverAPI:
             result = self.prover.complete(lean_code)
 
             assert result == "simp [sq_nonneg]"
+
+    def test_complete_reuses_one_client_across_calls(self):
+        """Test: repeated completions share a pooled HTTP client."""
+        with patch("httpx.Client.post") as mock_post:
+            mock_response = Mock()
+            mock_response.raise_for_status.return_value = None
+            mock_response.json.return_value = {
+                "choices": [{"message": {"content": "trivial"}}]
+            }
+            mock_post.return_value = mock_response
+
+            self.prover.complete("theorem a : True := by sorry")
+            client = self.prover.client
+            self.prover.complete("theorem b : True := by sorry")
+
+            assert self.prover.client is client
+            assert client.headers["Authorization"] == f"Bearer {self.api_key}"
+            assert mock_post.call_count == 2
+
+        self.prover.close()
+        assert self.prover._client is None
+
+    def test_context_manager_releases_pooled_client(self):
+        """Test: with closes the pooled client on exit."""
+        with ProverAPI(self.api_key) as prover:
+            client = prover.client
+        assert prover._client is None
+        assert client.is_closed
+
+    def test_complete_is_cached_by_model_and_lean_code(self, tmp_path):
+        """Test: repeat completions are served from memory or cache_dir."""
+        with patch("httpx.Client.post") as mock_post:
+            mock_response = Mock()
+            mock_response.raise_for_status.return_value = None
+            mock_response.json.return_value = {
+                "choices": [{"message": {"content": "by simp"}}]
+            }
+            mock_post.return_value = mock_response
+
+            prover = ProverAPI(self.api_key, cache_dir=tmp_path)
+            assert prover.complete("theorem a : True := by sorry") == "by simp"
+            assert prover.complete("theorem a : True := by sorry") == "by simp"
+            assert mock_post.call_count == 1
+
+            # A fresh client over the same directory reuses the stored proof
+            reloaded = ProverAPI(self.api_key, cache_dir=tmp_path)
+            assert reloaded.complete("theorem a : True := by sorry") == "by simp"
+            assert mock_post.call_count == 1
+
+            # A different model is a different completion
+            other = ProverAPI(self.api_key, model="other", cache_dir=tmp_path)
+            other.complete("theorem a : True := by sorry")
+            assert mock_post.call_count == 2
+
+    def test_streaming_client_is_reused_within_an_event_loop(self):
+        """Test: the pooled AsyncClient is shared per loop and closed by aclose."""
+
+        async def clients():
+            first = await self.prover._get_async_client()
+            second = await self.prover._get_async_client()
+            return first, second
+
+        first, second = asyncio.run(clients())
+        assert first is second
+
+        # A new event loop cannot reuse connections opened on the old one,
+        # and the replaced client is closed rather than leaked
+        third, _ = asyncio.run(clients())
+        assert third is not first
+        assert first.is_closed
+
+        asyncio.run(self.prover.aclose())
+        assert self.prover._async_client is None
+        assert third.is_closed
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import pytest
@@ -32,3 +33,50 @@ def test_write_proof_requires_placeholder():
     Path(lean_file_path).write_text("theorem x : True := by trivial", encoding="utf-8")
     with pytest.raises(ValidationError):
         spec.write_proof("by trivial")
+
+
+def test_write_proof_skips_reread_of_untouched_file(monkeypatch):
+    spec = SpecGen()
+    lean_file_path = spec.emit_lean()
+
+    def fail_read(*args, **kwargs):
+        raise AssertionError("unchanged Lean file was re-read")
+
+    # Treat the emitted file as older than the racy window
+    monkeypatch.setattr("proofstack.specgen._is_racy", lambda mtime_ns: False)
+    monkeypatch.setattr(Path, "read_text", fail_read)
+    spec.write_proof("by simp")
+    monkeypatch.undo()
+
+    content = Path(lean_file_path).read_text(encoding="utf-8")
+    assert "__PROOF_PLACEHOLDER__" not in content
+    assert "by simp" in content
+
+
+def test_write_proof_rereads_recently_rewritten_file():
+    spec = SpecGen()
+    lean_file = Path(spec.emit_lean())
+    st = lean_file.stat()
+
+    # Same-size rewrite that keeps the emitted mtime: the stat alone matches
+    original = lean_file.read_text(encoding="utf-8")
+    edited = original.replace("import Mathlib", "import MathliX", 1)
+    assert len(edited.encode()) == st.st_size
+    lean_file.write_text(edited, encoding="utf-8")
+    os.utime(lean_file, ns=(st.st_mtime_ns, st.st_mtime_ns))
+
+    spec.write_proof("by simp")
+    assert "import MathliX" in lean_file.read_text(encoding="utf-8")
+
+
+def test_generate_lean_content_is_memoized_on_spec():
+    first = SpecGen()
+    first.invariants = ["|σ.cart_position| ≤ 2.4"]
+    second = SpecGen()
+    second.invariants = ["|σ.cart_position| ≤ 2.4"]
+    assert first._generate_lean_content() is second._generate_lean_content()
+
+    # Mutating the spec lists renders fresh content
+    second.invariants.append("|σ.pole_angle| ≤ 0.2095")
+    assert "pole_angle| ≤ 0.2095" in second._generate_lean_content()
+    assert first._generate_lean_content() != second._generate_lean_content()